@@ -0,0 +1,281 @@
+"""Headless frame-time benchmark for every renderer and VisualizationType.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_visualizers --output results.json
+    python -m benchmarks.bench_visualizers --save-baseline benchmarks/baseline.json
+    python -m benchmarks.bench_visualizers --compare benchmarks/baseline.json
+
+Each case renders ``--frames`` frames of a synthetic signal into an
+offscreen widget, stepping the playback position by exactly one frame
+interval each time, so runs are repeatable. ``--analysis`` picks where
+the spectrum comes from: an FFT per frame (``chunk``, tracks without a
+SpectralIndex), the track's SpectralIndex (``index``) or an
+AnalysisWorker publishing from the index before every frame
+(``worker``), which is what playback does. It reports mean/p50/p95/p99
+frame time, the per-stage breakdown from FrameProfiler, Python
+allocations from a separate tracemalloc pass and the process's peak RSS.
+``--compare`` exits with status 1 if any case got slower or allocates
+more than the baseline allows.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+# Must be set before Qt is imported
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+import matplotlib
+from PyQt5.QtCore import PYQT_VERSION_STR
+from PyQt5.QtWidgets import QApplication
+
+from benchmarks.signals import SAMPLE_RATE, SIGNALS
+from src.core.analysis import build_spectral_index
+from src.core.analysis_worker import AnalysisWorker
+from src.core.audio_track import AudioTrack
+from src.core.frame_profiler import FrameProfiler
+from src.ui.widgets.painter_visualizer import PainterVisualizer
+from src.ui.widgets.visualizer_base import VisualizationType
+from src.ui.widgets.waveform_visualizer import WaveformVisualizer
+
+RENDERERS = {
+    'matplotlib-blit': lambda: WaveformVisualizer(width=8, height=4.5),
+    'matplotlib': lambda: WaveformVisualizer(width=8, height=4.5, blit=False),
+    'qpainter': PainterVisualizer,
+}
+
+# Where the visualizer's analysis comes from; see the module docstring
+ANALYSIS_MODES = ('chunk', 'index', 'worker')
+
+WIDGET_SIZE = (800, 450)
+FPS = 60
+# A case regresses when it is this much slower (relative) ...
+DEFAULT_TOLERANCE = 0.25
+# ... and also by more than these absolute amounts, so noise on very cheap
+# cases does not fail the comparison
+MIN_REGRESSION_MS = 0.5
+MIN_REGRESSION_KIB = 64
+COMPARED_METRICS = (
+    ('mean_ms', MIN_REGRESSION_MS),
+    ('p95_ms', MIN_REGRESSION_MS),
+    ('p99_ms', MIN_REGRESSION_MS),
+    ('alloc_peak_kib', MIN_REGRESSION_KIB),
+)
+
+
+class SteppedClock:
+    """Stands in for PlaybackClock and moves only when told to"""
+
+    def __init__(self, sample_rate: int):
+        self.sample_rate = sample_rate
+        self.running = True
+        self.frame = 0
+
+
+def peak_rss_mib():
+    """Peak resident set size of this process, or None where unavailable"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def build_visualizer(renderer: str, viz_type: VisualizationType, track: AudioTrack,
+                     worker: AnalysisWorker = None):
+    visualizer = RENDERERS[renderer]()
+    visualizer.resize(*WIDGET_SIZE)
+    visualizer.show()
+    visualizer.set_worker(worker)
+    visualizer.set_track(track)
+    visualizer.set_visualization_type(viz_type)
+    # Fixed seeds so particle counts, and therefore the work, are repeatable
+    visualizer.bar_particles.rng = np.random.default_rng(0)
+    visualizer.ring_particles.rng = np.random.default_rng(1)
+    visualizer.set_clock(SteppedClock(track.sample_rate))
+    QApplication.processEvents()
+    return visualizer
+
+
+def drive(app, visualizer, frames: int, start: int = 0, times=None):
+    """Render ``frames`` frames from frame number ``start``"""
+    clock = visualizer.clock
+    step = clock.sample_rate // FPS
+    for i in range(start, start + frames):
+        clock.frame = visualizer.chunk_size + i * step
+        if visualizer.worker is not None:
+            # The worker thread's job, done in step with the frames; the
+            # GUI thread's frame time is what is measured
+            visualizer.worker.publish(clock.frame)
+        begin = time.perf_counter_ns()
+        visualizer.update_plot()
+        if times is not None:
+            times.append(time.perf_counter_ns() - begin)
+        # Let Qt deliver paint and resize events outside the measured time
+        app.processEvents()
+
+
+def run_case(app, renderer: str, viz_type: VisualizationType, track: AudioTrack,
+             frames: int, warmup: int, alloc_frames: int, use_worker: bool = False) -> dict:
+    worker = AnalysisWorker(SteppedClock(track.sample_rate)) if use_worker else None
+    visualizer = build_visualizer(renderer, viz_type, track, worker)
+    profiler = FrameProfiler(window=frames)
+    try:
+        drive(app, visualizer, warmup)
+        visualizer.profiler = profiler
+        if worker is not None:
+            worker.profiler = profiler
+        times = []
+        drive(app, visualizer, frames, start=warmup, times=times)
+
+        # Allocations in a separate pass; tracing would distort the timings
+        visualizer.profiler = FrameProfiler(window=1)
+        if worker is not None:
+            worker.profiler = visualizer.profiler
+        tracemalloc.start()
+        start_current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        drive(app, visualizer, alloc_frames, start=warmup + frames)
+        end_current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        if worker is not None:
+            worker.close()
+        visualizer.close()
+        visualizer.deleteLater()
+        app.processEvents()
+
+    stages = {}
+    for name in profiler.stage_names():
+        stats = profiler.stats(name)
+        stages[name] = {key: stats[key] for key in ('mean', 'p95', 'p99')}
+
+    ms = np.array(times, dtype=np.float64) / 1e6
+    p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+    return {
+        'frames': len(ms),
+        'mean_ms': float(ms.mean()),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+        'max_ms': float(ms.max()),
+        'alloc_peak_kib': (peak - start_current) / 1024,
+        'alloc_retained_kib': (end_current - start_current) / 1024,
+        'peak_rss_mib': peak_rss_mib(),
+        'stages': stages,
+    }
+
+
+def run(args) -> dict:
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    seconds = (args.warmup + args.frames + args.alloc_frames) / FPS + 1
+    results = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'matplotlib': matplotlib.__version__,
+            'pyqt': PYQT_VERSION_STR,
+            'frames': args.frames,
+            'warmup': args.warmup,
+            'alloc_frames': args.alloc_frames,
+            'widget_size': list(WIDGET_SIZE),
+            'analysis': args.analysis,
+        },
+        'cases': {},
+    }
+    for signal in args.signals:
+        data = SIGNALS[signal](seconds)
+        # Separate tracks so only the indexed one carries a SpectralIndex
+        tracks = {'chunk': AudioTrack(data, SAMPLE_RATE)}
+        if {'index', 'worker'} & set(args.analysis):
+            indexed = AudioTrack(data, SAMPLE_RATE)
+            indexed.analysis = build_spectral_index(indexed)
+            tracks['index'] = tracks['worker'] = indexed
+        for renderer, viz_type, mode in itertools.product(args.renderers, args.types,
+                                                           args.analysis):
+            # Per-chunk cases keep the keys of baselines saved before the modes existed
+            key = f"{renderer}/{viz_type.value}/{signal}"
+            if mode != 'chunk':
+                key += f"/{mode}"
+            case = run_case(app, renderer, viz_type, tracks[mode], args.frames, args.warmup,
+                            args.alloc_frames, use_worker=mode == 'worker')
+            results['cases'][key] = case
+            print(f"{key:<47} mean {case['mean_ms']:7.2f}  p95 {case['p95_ms']:7.2f}  "
+                  f"p99 {case['p99_ms']:7.2f} ms  alloc {case['alloc_peak_kib']:8.1f} KiB",
+                  flush=True)
+    results['peak_rss_mib'] = peak_rss_mib()
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float):
+    """Regression messages for every case worse than ``baseline``"""
+    regressions = []
+    for key, case in results['cases'].items():
+        old = baseline.get('cases', {}).get(key)
+        if old is None:
+            continue
+        for metric, minimum in COMPARED_METRICS:
+            before, after = old.get(metric), case.get(metric)
+            if before is None or after is None:
+                continue
+            if after > before * (1 + tolerance) and after - before > minimum:
+                regressions.append(f"{key}: {metric} {before:.2f} -> {after:.2f}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=300, help="measured frames per case")
+    parser.add_argument('--warmup', type=int, default=30, help="unmeasured frames first")
+    parser.add_argument('--alloc-frames', type=int, default=60,
+                        help="frames in the tracemalloc pass")
+    parser.add_argument('--renderers', nargs='+', choices=list(RENDERERS), default=list(RENDERERS))
+    parser.add_argument('--types', nargs='+', type=VisualizationType,
+                        default=list(VisualizationType), metavar='TYPE',
+                        help=" ".join(t.value for t in VisualizationType))
+    parser.add_argument('--signals', nargs='+', choices=list(SIGNALS), default=list(SIGNALS))
+    parser.add_argument('--analysis', nargs='+', choices=ANALYSIS_MODES,
+                        default=list(ANALYSIS_MODES), help="where the spectrum comes from")
+    parser.add_argument('--output', help="write results to this JSON file")
+    parser.add_argument('--save-baseline', metavar='PATH', help="also store results as a baseline")
+    parser.add_argument('--compare', metavar='PATH', help="fail on regressions against a baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed relative slowdown (default %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run(args)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(results, f, indent=2)
+            print(f"Wrote {path}")
+    print(f"Peak RSS: {results['peak_rss_mib']} MiB")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} REGRESSION(S) against {args.compare}:", file=sys.stderr)
+            for line in regressions:
+                print(f"  REGRESSION {line}", file=sys.stderr)
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""Deterministic synthetic signals for the benchmarks.
+
+Every generator returns float32 ``(frames, 2)`` data and uses a fixed seed,
+so two runs feed the visualizers exactly the same samples.
+"""
+import numpy as np
+
+SAMPLE_RATE = 44100
+SEED = 1234
+
+
+def sine_sweep(seconds: float, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Logarithmic sweep from 20 Hz to 20 kHz; moves through every band"""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    low, high = 20.0, 20000.0
+    rate = np.log(high / low) / seconds
+    phase = 2 * np.pi * low * (np.exp(rate * t) - 1) / rate
+    mono = 0.8 * np.sin(phase)
+    return np.column_stack((mono, mono)).astype(np.float32)
+
+
+def noise(seconds: float, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """White noise; every band busy, lots of particles"""
+    rng = np.random.default_rng(SEED)
+    return (0.3 * rng.standard_normal((int(seconds * sample_rate), 2))).astype(np.float32)
+
+
+def silence(seconds: float, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """All zeros; the cheapest frames and the degenerate normalization path"""
+    return np.zeros((int(seconds * sample_rate), 2), dtype=np.float32)
+
+
+def dense_mix(seconds: float, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Chords, a kick on every beat and some noise, roughly like a full mix"""
+    rng = np.random.default_rng(SEED)
+    frames = int(seconds * sample_rate)
+    t = np.arange(frames) / sample_rate
+
+    # Forty partials with slow tremolo, a different random set per channel
+    mix = np.zeros((frames, 2))
+    for channel in range(2):
+        freqs = rng.uniform(55, 8000, 40)
+        phases = rng.uniform(0, 2 * np.pi, 40)
+        for freq, phase in zip(freqs, phases):
+            tremolo = 0.5 + 0.5 * np.sin(2 * np.pi * 0.5 * t + phase)
+            mix[:, channel] += np.sin(2 * np.pi * freq * t + phase) * tremolo / 40
+
+    # Decaying 60 Hz kick at 120 bpm
+    beat = t % 0.5
+    mix += (np.sin(2 * np.pi * 60 * beat) * np.exp(-beat * 12))[:, np.newaxis]
+    mix += 0.05 * rng.standard_normal((frames, 2))
+    return np.clip(0.6 * mix, -1, 1).astype(np.float32)
+
+
+SIGNALS = {
+    'sine_sweep': sine_sweep,
+    'noise': noise,
+    'silence': silence,
+    'dense_mix': dense_mix,
+}
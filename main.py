@@ -1,11 +1,43 @@
+import time
+# Taken before anything else is imported, so the report covers the imports too
+_started = time.perf_counter()
+
+import argparse
 import sys
-from PyQt5.QtWidgets import QApplication
-from src.ui.main_window import MainWindow
+
+from src.core.startup_timer import StartupTimer
+
+# Modules that startup defers until they are needed
+DEFERRED_MODULES = ('matplotlib', 'pygame', 'soundfile')
+
 
 def main():
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    window.show()
+    parser = argparse.ArgumentParser(description="Audio player with real-time visualizations")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="print how long each import and initialisation step took")
+    args, qt_args = parser.parse_known_args()
+
+    timer = StartupTimer(_started)
+    with timer.stage('import PyQt5'):
+        from PyQt5.QtWidgets import QApplication
+    with timer.stage('import main window'):
+        from src.ui.main_window import MainWindow
+    with timer.stage('create QApplication'):
+        app = QApplication(sys.argv[:1] + qt_args)
+    with timer.stage('create main window'):
+        window = MainWindow(timer)
+    with timer.stage('show main window'):
+        window.show()
+
+    if args.profile_startup:
+        loaded = [name for name in DEFERRED_MODULES if name in sys.modules]
+
+        def report():
+            print(timer.report(), file=sys.stderr)
+            print("Deferred modules loaded before the window appeared: "
+                  + (', '.join(loaded) or 'none'), file=sys.stderr)
+
+        window.startup_finished.connect(report)
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
@@ -0,0 +1,277 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.core.audio_track import ProgressCallback
+from src.core.frame_profiler import NULL_PROFILER
+
+DEFAULT_FRAME_SIZE = 2048
+DEFAULT_HOP = 1024
+DEFAULT_BAND_COUNTS = (64, 32)
+# Bars are spread over this range; the highlights split the spectrum linearly
+BAND_SCALES = ('log', 'mel', 'linear')
+DEFAULT_BAND_SCALE = 'log'
+BAND_MIN_FREQ = 40.0
+BAND_MAX_FREQ = 16000.0
+# Every n-th spectrum bin is kept for the spectrum visualization
+SPECTRUM_STEP = 4
+NUM_HIGHLIGHTS = 4
+DB_FLOOR = -60.0
+# STFT frames computed per batch; bounds the temporary arrays
+_BATCH_FRAMES = 512
+
+
+@lru_cache(maxsize=8)
+def analysis_window(frame_size: int) -> np.ndarray:
+    return np.hanning(frame_size).astype(np.float32)
+
+
+def _hz_to_mel(freqs):
+    return 2595 * np.log10(1 + np.asarray(freqs) / 700)
+
+
+def _mel_to_hz(mels):
+    return 700 * (10 ** (np.asarray(mels) / 2595) - 1)
+
+
+class BandMap:
+    """Groups the FFT bins of one frame size into ``num_bands`` bands.
+
+    Band edges are spaced on a ``'log'`` or ``'mel'`` frequency scale
+    between BAND_MIN_FREQ and BAND_MAX_FREQ, or evenly over every bin for
+    ``'linear'``. Every band gets at least one bin, so the narrow bands at
+    the bottom of a log scale take consecutive single bins. Use
+    ``band_map()`` to share one map per layout.
+    """
+
+    def __init__(self, sample_rate: int, frame_size: int, num_bands: int,
+                 scale: str = DEFAULT_BAND_SCALE):
+        if scale not in BAND_SCALES:
+            raise ValueError(f"Unknown band scale {scale!r}")
+        num_bins = frame_size // 2
+        if not 0 < num_bands <= num_bins:
+            raise ValueError(f"Cannot split {num_bins} bins into {num_bands} bands")
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.num_bands = num_bands
+        self.scale = scale
+
+        bin_width = sample_rate / frame_size
+        if scale == 'linear':
+            edges = (np.arange(num_bands + 1) * num_bins) // num_bands
+        else:
+            high = min(BAND_MAX_FREQ, sample_rate / 2)
+            low = min(BAND_MIN_FREQ, high / 2)
+            if scale == 'log':
+                freqs = np.geomspace(low, high, num_bands + 1)
+            else:
+                freqs = _mel_to_hz(np.linspace(_hz_to_mel(low), _hz_to_mel(high), num_bands + 1))
+            edges = np.rint(freqs / bin_width).astype(int)
+            # At least one bin per band, without running past the last bin
+            steps = np.arange(num_bands + 1)
+            edges = np.maximum.accumulate(edges - steps) + steps
+            edges = np.minimum(edges, num_bins - num_bands + steps)
+        self.starts = edges[:-1]
+        self.stop = int(edges[-1])
+        self.sizes = np.diff(edges).astype(np.float32)
+        # Frequency range of each band in Hz
+        self.edges = edges * bin_width
+
+    def reduce(self, values: np.ndarray) -> np.ndarray:
+        """Mean of ``values`` over each band, along the last axis"""
+        return np.add.reduceat(values[..., :self.stop], self.starts, axis=-1) / self.sizes
+
+
+@lru_cache(maxsize=32)
+def band_map(sample_rate: int, frame_size: int, num_bands: int,
+             scale: str = DEFAULT_BAND_SCALE) -> BandMap:
+    """The shared BandMap for one layout, built on first use"""
+    return BandMap(sample_rate, frame_size, num_bands, scale)
+
+
+@dataclass
+class AnalysisFrame:
+    """Everything the visualizations need for one moment of the track.
+
+    All values are normalized to 0..1. ``spectrum`` is the dB spectrum at
+    every ``SPECTRUM_STEP``-th bin, ``bands`` maps a band count to the mean
+    peak-normalized magnitude of each band and ``highlights`` holds the
+    mean dB level of the spectrum's four quarters. Bands are log-spaced
+    (see BandMap), so low bars follow the bass and high bars the treble.
+    """
+    spectrum: np.ndarray
+    bands: Dict[int, np.ndarray]
+    highlights: np.ndarray
+
+
+def spectrum_magnitude(frames: np.ndarray) -> np.ndarray:
+    """Windowed FFT magnitude of a ``(n, frame_size)`` stack of mono frames"""
+    return np.abs(np.fft.rfft(frames * analysis_window(frames.shape[1]), axis=1))
+
+
+def reduce_magnitude(magnitude: np.ndarray, sample_rate: int, frame_size: int,
+                     band_counts: Sequence[int] = DEFAULT_BAND_COUNTS):
+    """Turn FFT magnitudes into ``(spectrum, bands, highlights)`` rows"""
+    magnitude_db = 20 * np.log10(magnitude + 1e-10)
+    db_normalized = (np.clip(magnitude_db, DB_FLOOR, 0) - DB_FLOOR) / -DB_FLOOR
+    spectrum = db_normalized[:, ::SPECTRUM_STEP]
+    highlights = band_map(sample_rate, frame_size, NUM_HIGHLIGHTS, 'linear').reduce(db_normalized)
+
+    # Band energies use the peak-normalized magnitude below Nyquist
+    usable = magnitude[:, :frame_size // 2]
+    peak = usable.max(axis=1, keepdims=True)
+    normalized = np.divide(usable, peak, out=np.zeros_like(usable), where=peak > 0)
+    bands = {count: band_map(sample_rate, frame_size, count).reduce(normalized)
+             for count in band_counts}
+    return spectrum, bands, highlights
+
+
+def analyze_frames(frames: np.ndarray, sample_rate: int,
+                   band_counts: Sequence[int] = DEFAULT_BAND_COUNTS):
+    """Vectorized analysis of a ``(n, frame_size)`` stack of mono frames.
+
+    Returns ``(spectrum, bands, highlights)`` arrays with one row per frame.
+    """
+    return reduce_magnitude(spectrum_magnitude(frames), sample_rate, frames.shape[1], band_counts)
+
+
+def analyze_chunk(chunk: np.ndarray, sample_rate: int,
+                  band_counts: Sequence[int] = DEFAULT_BAND_COUNTS,
+                  profiler=NULL_PROFILER) -> AnalysisFrame:
+    """Analyse a single mono chunk; used when no index is available"""
+    with profiler.stage('fft'):
+        magnitude = spectrum_magnitude(chunk[np.newaxis, :])
+    with profiler.stage('band reduction'):
+        spectrum, bands, highlights = reduce_magnitude(magnitude, sample_rate, len(chunk), band_counts)
+    return AnalysisFrame(spectrum[0], {n: b[0] for n, b in bands.items()}, highlights[0])
+
+
+def _quantize(values: np.ndarray) -> np.ndarray:
+    return np.rint(np.clip(values, 0, 1) * 255).astype(np.uint8)
+
+
+class SpectralIndex:
+    """STFT features for a whole track, computed once at load time.
+
+    Frame ``i`` covers samples ``[i * hop, i * hop + frame_size)``. Values
+    are quantized to uint8, so an hour of 44.1 kHz audio with the default
+    hop takes a few tens of MB. Looking up a frame is O(1), which keeps
+    the per-tick cost of every visualization independent of the FFT size.
+    """
+
+    def __init__(self, sample_rate: int, frame_size: int, hop: int,
+                 spectrum: np.ndarray, bands: Dict[int, np.ndarray], highlights: np.ndarray):
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.hop = hop
+        self.spectrum = spectrum
+        self.bands = bands
+        self.highlights = highlights
+
+    def __len__(self):
+        return len(self.spectrum)
+
+    @property
+    def band_counts(self):
+        return tuple(self.bands)
+
+    @property
+    def spectrum_freqs(self) -> np.ndarray:
+        return np.fft.rfftfreq(self.frame_size, 1 / self.sample_rate)[::SPECTRUM_STEP]
+
+    def frame_index(self, sample_frame: int) -> int:
+        """Index of the STFT frame centred closest to ``sample_frame``"""
+        index = int(round((sample_frame - self.frame_size // 2) / self.hop))
+        return min(max(index, 0), len(self) - 1)
+
+    def frame_at(self, sample_frame: int) -> AnalysisFrame:
+        i = self.frame_index(sample_frame)
+        scale = np.float32(1 / 255)
+        return AnalysisFrame(
+            self.spectrum[i] * scale,
+            {n: b[i] * scale for n, b in self.bands.items()},
+            self.highlights[i] * scale,
+        )
+
+
+class SpectralIndexBuilder:
+    """Builds the SpectralIndex of ``total_frames`` samples fed in consecutive mono blocks.
+
+    Blocks can have any size; the samples the next STFT frames still
+    overlap are carried over, so a track can be indexed in the same read
+    that feeds other analyses.
+    """
+
+    def __init__(self, sample_rate: int, total_frames: int, frame_size: int = DEFAULT_FRAME_SIZE,
+                 hop: int = DEFAULT_HOP, band_counts: Sequence[int] = DEFAULT_BAND_COUNTS):
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.hop = hop
+        self.band_counts = tuple(band_counts)
+        self.num_frames = 1 + (total_frames - frame_size) // hop if total_frames >= frame_size else 0
+        num_bins = frame_size // 2 + 1
+        self.spectrum = np.zeros((self.num_frames, len(range(0, num_bins, SPECTRUM_STEP))), dtype=np.uint8)
+        self.bands = {n: np.zeros((self.num_frames, n), dtype=np.uint8) for n in self.band_counts}
+        self.highlights = np.zeros((self.num_frames, NUM_HIGHLIGHTS), dtype=np.uint8)
+        # Next STFT frame to compute, and the samples from its start on
+        self._next = 0
+        self._pending = np.zeros(0, dtype=np.float32)
+
+    def feed(self, mono: np.ndarray):
+        data = np.concatenate((self._pending, mono)) if len(self._pending) else mono
+        available = 1 + (len(data) - self.frame_size) // self.hop if len(data) >= self.frame_size else 0
+        count = min(available, self.num_frames - self._next)
+        for first in range(0, count, _BATCH_FRAMES):
+            batch = min(_BATCH_FRAMES, count - first)
+            samples = data[first * self.hop:(first + batch - 1) * self.hop + self.frame_size]
+            frames = sliding_window_view(samples, self.frame_size)[::self.hop]
+            spectrum, bands, highlights = analyze_frames(frames, self.sample_rate, self.band_counts)
+            rows = slice(self._next + first, self._next + first + batch)
+            self.spectrum[rows] = _quantize(spectrum)
+            self.highlights[rows] = _quantize(highlights)
+            for n in self.band_counts:
+                self.bands[n][rows] = _quantize(bands[n])
+        self._next += count
+        self._pending = data[count * self.hop:].astype(np.float32, copy=True)
+
+    def result(self) -> Optional[SpectralIndex]:
+        """The index, or None for fewer samples than one frame.
+
+        Frames never fed (header frame counts can overstate compressed
+        files) stay silent.
+        """
+        if self.num_frames == 0:
+            return None
+        return SpectralIndex(self.sample_rate, self.frame_size, self.hop,
+                             self.spectrum, self.bands, self.highlights)
+
+
+def build_spectral_index(track, frame_size: int = DEFAULT_FRAME_SIZE, hop: int = DEFAULT_HOP,
+                         band_counts: Sequence[int] = DEFAULT_BAND_COUNTS,
+                         progress: Optional[ProgressCallback] = None) -> Optional[SpectralIndex]:
+    """Compute the SpectralIndex of ``track`` in batches of strided frames.
+
+    Streaming tracks are read through their own file handle so the
+    playback window is left alone. Returns None for tracks shorter than
+    one frame.
+    """
+    builder = SpectralIndexBuilder(track.sample_rate, track.frames, frame_size, hop, band_counts)
+    if builder.num_frames == 0:
+        return None
+    step = _BATCH_FRAMES * hop
+    source = track.clone() if track.streaming else track
+    try:
+        for start in range(0, track.frames, step):
+            mono = source.read(start, step).mean(axis=1, dtype=np.float32)
+            if len(mono) == 0:
+                break
+            builder.feed(mono)
+            if progress is not None:
+                progress(min(1.0, (start + step) / track.frames))
+    finally:
+        if source is not track:
+            source.close()
+    return builder.result()
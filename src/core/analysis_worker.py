@@ -0,0 +1,152 @@
+import logging
+import threading
+from typing import Optional, Sequence
+
+import numpy as np
+
+from src.core.analysis import (AnalysisFrame, DEFAULT_BAND_COUNTS, DEFAULT_FRAME_SIZE,
+                               NUM_HIGHLIGHTS, SPECTRUM_STEP, analyze_chunk)
+from src.core.frame_profiler import NULL_PROFILER
+from src.core.playback_clock import PlaybackClock
+
+logger = logging.getLogger(__name__)
+
+# Analysis frames published per second; twice the default frame rate so the
+# newest frame is never more than half a rendered frame old
+DEFAULT_RATE = 120
+# Slots in the ring; the reader's slot is not rewritten for two more publishes
+_SLOTS = 3
+
+
+class AnalysisSnapshot:
+    """One published moment: the waveform slice and its analysis.
+
+    Snapshots are preallocated and rewritten in place by the worker, so
+    readers should use them right away and not keep them across frames.
+    """
+
+    def __init__(self, chunk_size: int, band_counts: Sequence[int]):
+        self.track = None
+        self.frame = -1
+        self.chunk = np.zeros(chunk_size, dtype=np.float32)
+        num_bins = chunk_size // 2 + 1
+        self.analysis = AnalysisFrame(
+            np.zeros(len(range(0, num_bins, SPECTRUM_STEP)), dtype=np.float32),
+            {n: np.zeros(n, dtype=np.float32) for n in band_counts},
+            np.zeros(NUM_HIGHLIGHTS, dtype=np.float32),
+        )
+
+    def store(self, chunk: np.ndarray, analysis: AnalysisFrame):
+        np.copyto(self.chunk, chunk)
+        np.copyto(self.analysis.spectrum, analysis.spectrum)
+        for n, bands in self.analysis.bands.items():
+            np.copyto(bands, analysis.bands[n])
+        np.copyto(self.analysis.highlights, analysis.highlights)
+
+
+class AnalysisWorker:
+    """Reads and analyses the audio under the playback clock off the GUI thread.
+
+    A background thread wakes ``rate`` times per second, looks half a
+    period ahead of the clock, reads the mono chunk there and analyses it
+    (a lookup when the track has a matching SpectralIndex, an FFT
+    otherwise). The result is written into the next slot of a small ring
+    and published by swapping a single index, so the render callback never
+    waits: ``latest()`` just returns the newest complete snapshot. numpy
+    releases the GIL during the FFT, so the analysis runs on another core.
+    """
+
+    def __init__(self, clock: PlaybackClock, chunk_size: int = DEFAULT_FRAME_SIZE,
+                 band_counts: Sequence[int] = DEFAULT_BAND_COUNTS, rate: float = DEFAULT_RATE):
+        self.clock = clock
+        self.rate = rate
+        self.track = None
+        # Times chunk fetch, mixdown and analysis stages; shared with the GUI
+        self.profiler = NULL_PROFILER
+        # Serializes analysis with track changes, never taken by readers
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._active = False
+        self._closing = False
+        self._latest: Optional[int] = None
+        self._next = 0
+        self.configure(chunk_size, band_counts)
+        self._thread = threading.Thread(target=self._run, name='analysis-worker', daemon=True)
+        self._thread.start()
+
+    def configure(self, chunk_size: int, band_counts: Sequence[int]):
+        """Change the chunk size or band counts; drops published snapshots"""
+        with self._lock:
+            self.chunk_size = chunk_size
+            self.band_counts = tuple(band_counts)
+            self._slots = [AnalysisSnapshot(chunk_size, self.band_counts) for _ in range(_SLOTS)]
+            self._latest = None
+
+    def set_track(self, track):
+        """Analyse ``track`` from now on; waits for a running analysis to finish"""
+        with self._lock:
+            self.track = track
+            self._latest = None
+
+    def set_active(self, active: bool):
+        """Only work while something is being rendered"""
+        self._active = active
+        if active:
+            self._wake.set()
+
+    def latest(self) -> Optional[AnalysisSnapshot]:
+        """Newest complete snapshot, or None before the first one"""
+        index = self._latest
+        return self._slots[index] if index is not None else None
+
+    def close(self):
+        self._closing = True
+        self._wake.set()
+        self._thread.join(timeout=1.0)
+
+    def _run(self):
+        while not self._closing:
+            if not self._active:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            period = 1 / self.rate
+            if self.clock.running:
+                try:
+                    self.publish(self.clock.frame + int(period / 2 * self.clock.sample_rate))
+                except Exception as e:
+                    # A failed read skips one frame; the thread keeps running
+                    logger.warning("Analysis failed: %s", e)
+            self._wake.wait(period)
+            self._wake.clear()
+
+    def publish(self, frame: int):
+        """Analyse the chunk around ``frame`` and publish it; the thread calls this ``rate`` times a second"""
+        with self._lock:
+            track = self.track
+            if track is None or frame >= track.frames:
+                return
+            profiler = self.profiler
+            start = max(0, frame - self.chunk_size // 2)
+            with profiler.stage('chunk fetch'):
+                chunk = track.read(start, self.chunk_size)
+            if len(chunk) < self.chunk_size:
+                return
+            with profiler.stage('channel mixdown'):
+                chunk = chunk.mean(axis=1)
+
+            index = track.analysis
+            if (index is not None and index.frame_size == self.chunk_size
+                    and all(n in index.bands for n in self.band_counts)):
+                with profiler.stage('index lookup'):
+                    analysis = index.frame_at(frame)
+            else:
+                analysis = analyze_chunk(chunk, track.sample_rate, self.band_counts, profiler)
+
+            slot = self._slots[self._next]
+            slot.store(chunk, analysis)
+            slot.track = track
+            slot.frame = frame
+            # Publishing is one reference swap; the reader never locks
+            self._latest = self._next
+            self._next = (self._next + 1) % _SLOTS
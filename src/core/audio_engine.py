@@ -1,55 +1,323 @@
-import pygame
-import soundfile as sf
-from typing import Optional, Tuple
+import logging
+import threading
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from src.core.audio_output import AudioOutput, PygameOutput
+from src.core.audio_track import AudioTrack
+from src.core.loudness import DEFAULT_TARGET_LUFS
+from src.core.pcm_cache import PCMCache
+from src.core.playback_clock import PlaybackClock
+
+logger = logging.getLogger(__name__)
 
 class AudioEngine:
-    def __init__(self):
+    """Plays an AudioTrack by feeding its PCM to an AudioOutput.
+
+    A feeder thread reads blocks from the track at the current read
+    position and hands them to the output, counting every delivered frame
+    on the playback clock. Seeking only moves the read position and flushes
+    the output, so it costs the same anywhere in the track.
+
+    A track passed to ``queue_next`` is switched to by the feeder as soon as
+    the current one runs out, while the output still holds the tail of the
+    previous track, so there is no gap. ``on_track_changed`` is then called
+    from the feeder thread with the new track. Tracks that are done with
+    go through ``release``, which leaves closing a track the feeder is
+    still reading to the feeder.
+
+    With ``normalize`` on, each block is scaled by the gain that brings its
+    track to ``target_loudness``, worked out from the ``track.loudness``
+    measured when the track was loaded; nothing is analysed while playing.
+    """
+
+    def __init__(self, cache: Optional[PCMCache] = None,
+                 output: Optional[AudioOutput] = None, block_frames: int = 4096):
+        self.cache = cache
+        self.output = output if output is not None else PygameOutput()
+        self.block_frames = block_frames
         self.playing: bool = False
         self.paused: bool = False
         self.current_position: float = 0
         self.duration: float = 0
         self.channels = None
         self.sample_rate = None
-        self._init_pygame()
-    
-    def _init_pygame(self):
-        pygame.mixer.init()
-        pygame.mixer.music.set_volume(1.0)
-    
-    def load_file(self, file_path: str) -> bool:
+        self.track: Optional[AudioTrack] = None
+        self.clock = PlaybackClock()
+        self.on_track_changed: Optional[Callable[[AudioTrack], None]] = None
+        self.normalize: bool = True
+        self.target_loudness: float = DEFAULT_TARGET_LUFS
+
+        self._next_track: Optional[AudioTrack] = None
+        self._cond = threading.Condition()
+        self._read_frame = 0
+        self._gain = 1.0
+        self._generation = 0
+        self._at_end = False
+        self._closing = False
+        # Track the feeder reads outside the lock, and tracks to close after
+        self._reading: Optional[AudioTrack] = None
+        self._retired = []
+        self._reopen_pending = False
+        self._output_format: Optional[Tuple[int, int]] = None
+        self._feeder = threading.Thread(target=self._feed, name='audio-feeder', daemon=True)
+        self._feeder.start()
+
+    def load_file(self, file_path: str, streaming: Optional[bool] = None) -> bool:
+        """Decode ``file_path`` and use it for playback; decode errors propagate"""
+        track = AudioTrack.open(file_path, streaming=streaming, cache=self.cache)
+        if not self.load_track(track):
+            track.close()
+            return False
+        return True
+
+    def load_track(self, track: AudioTrack) -> bool:
+        """Use an already decoded track for playback"""
+        self.stop()
         try:
-            pygame.mixer.music.load(file_path)
-            audio_data, sample_rate = sf.read(file_path)
-            self.duration = len(audio_data) / sample_rate
-            self.channels = audio_data.shape[1] if len(audio_data.shape) > 1 else 1
-            self.sample_rate = sample_rate
-            self.current_position = 0
-            return True
+            if self._output_format != (track.sample_rate, track.channels):
+                self.output.open(track.sample_rate, track.channels)
+                self._output_format = (track.sample_rate, track.channels)
         except Exception as e:
+            logger.warning("Opening audio output failed: %s", e)
+            self._output_format = None
             return False
-    
-    def play(self, start_pos: float = 0):
-        if start_pos > 0:
-            pygame.mixer.music.play(start=start_pos)
+        with self._cond:
+            for old in (self.track, self._next_track):
+                if old is not None and old is not track:
+                    self._release(old)
+            self._next_track = None
+            self._set_track(track)
+        return True
+
+    def _set_track(self, track: AudioTrack):
+        # Caller holds self._cond
+        self.track = track
+        self.duration = track.duration
+        self.channels = track.channels
+        self.sample_rate = track.sample_rate
+        self.current_position = 0
+        self._read_frame = 0
+        self._at_end = False
+        self._gain = self.track_gain(track)
+        self.clock.reset(track.sample_rate, track.frames)
+
+    def release(self, track: Optional[AudioTrack]):
+        """Close ``track`` once the feeder no longer reads it; safe from any thread"""
+        if track is None:
+            return
+        with self._cond:
+            self._release(track)
+
+    def _release(self, track: AudioTrack):
+        # Caller holds self._cond
+        if track is self._reading:
+            self._retired.append(track)
         else:
-            pygame.mixer.music.play()
-        self.playing = True
-        self.paused = False
-        self.current_position = start_pos
-    
+            track.close()
+
+    def track_gain(self, track: AudioTrack) -> float:
+        """Linear gain applied to ``track``; 1.0 if it wasn't measured"""
+        loudness = getattr(track, 'loudness', None)
+        if not self.normalize or loudness is None:
+            return 1.0
+        return 10 ** (loudness.gain_db(self.target_loudness) / 20)
+
+    def set_normalization(self, enabled: bool, target: Optional[float] = None):
+        """Turn loudness normalization on or off; applies from the next block"""
+        with self._cond:
+            self.normalize = enabled
+            if target is not None:
+                self.target_loudness = target
+            if self.track is not None:
+                self._gain = self.track_gain(self.track)
+
+    def set_buffer_size(self, frames: int):
+        """Reopen the output with a ``frames`` long device buffer, keeping the position.
+
+        The audio queued in the old buffer is dropped and read again, so
+        this costs a short gap, not a restart. Outputs without a
+        ``buffer_size`` ignore it.
+        """
+        with self._cond:
+            if getattr(self.output, 'buffer_size', frames) == frames:
+                return
+            self.output.buffer_size = frames
+            if self._output_format is None:
+                return
+            if self._reading is not None:
+                # The feeder may be polling the output; it reopens it after the read
+                self._reopen_pending = True
+            else:
+                self._reopen_output()
+
+    def _reopen_output(self):
+        # Caller holds self._cond and the feeder is not using the output
+        self._reopen_pending = False
+        position = self.clock.position
+        self.output.flush()
+        try:
+            self.output.open(*self._output_format)
+        except Exception as e:
+            logger.warning("Audio output failed: %s", e)
+            self._output_format = None
+            return
+        self._move_to(position)
+        if self.paused:
+            self.output.pause()
+        self._cond.notify_all()
+
+    def queue_next(self, track: Optional[AudioTrack]):
+        """Play ``track`` right after the current one ends; safe from any thread"""
+        with self._cond:
+            self._next_track = track
+            if track is not None and self._at_end and self.playing:
+                # The current track already ran out, start the next one now
+                self._at_end = False
+                self._cond.notify_all()
+
+    def _switch_to_next(self) -> AudioTrack:
+        # Caller holds self._cond
+        track = self._next_track
+        self._next_track = None
+        # The previous track's tail is still queued in the output; the new
+        # track is heard, and its clock runs, only once that has played
+        queued = max(0, self._read_frame - self.clock.frame) / self.sample_rate
+        if self._output_format != (track.sample_rate, track.channels):
+            # A format change needs a new output, so this switch is not gapless
+            try:
+                self.output.open(track.sample_rate, track.channels)
+            except Exception as e:
+                logger.warning("Audio output failed: %s", e)
+            self._output_format = (track.sample_rate, track.channels)
+            queued = 0.0
+        self._generation += 1
+        self._set_track(track)
+        self.clock.start(delay=queued)
+        return track
+
+    @property
+    def position(self) -> float:
+        """Playback position in seconds, read from the playback clock"""
+        return self.clock.position
+
+    def _feed(self):
+        while True:
+            with self._cond:
+                while not self._closing and (not self.playing or self.paused or self._at_end):
+                    self._cond.wait()
+                if self._closing:
+                    return
+                track = self.track
+                start = self._read_frame
+                generation = self._generation
+                gain = self._gain
+                self._reading = track
+
+            try:
+                self.output.wait()
+                block = track.read(start, self.block_frames)
+                if gain != 1.0 and len(block):
+                    block = block * np.float32(gain)
+            except Exception as e:
+                logger.warning("Reading audio failed: %s", e)
+                block = None
+
+            with self._cond:
+                self._reading = None
+                for retired in self._retired:
+                    retired.close()
+                self._retired.clear()
+                if self._reopen_pending:
+                    self._reopen_output()
+                if block is None:
+                    # Keep the thread alive for the next track or seek
+                    if generation == self._generation:
+                        self._at_end = True
+                    continue
+                # A seek, pause or stop happened while we were waiting
+                if generation != self._generation or not self.playing or self.paused:
+                    continue
+                if len(block) == 0:
+                    if self._next_track is None:
+                        self._at_end = True
+                        continue
+                    track = self._switch_to_next()
+                    callback = self.on_track_changed
+                else:
+                    callback = None
+                    self._write(start, block)
+            if callback is not None:
+                callback(track)
+
+    def _write(self, start: int, block):
+        # Caller holds self._cond
+        try:
+            self.output.write(block)
+        except Exception as e:
+            logger.warning("Audio output failed: %s", e)
+            self._at_end = True
+            return
+        self._read_frame = start + len(block)
+        self.clock.advance(len(block))
+
+    def _move_to(self, position: float):
+        # Caller holds self._cond
+        self._generation += 1
+        self._read_frame = int(position * self.sample_rate) if self.sample_rate else 0
+        self._at_end = False
+        self.output.flush()
+        self.clock.seek(position)
+        self.current_position = position
+
+    def play(self, start_pos: float = 0):
+        if self.track is None:
+            return
+        with self._cond:
+            self._move_to(start_pos)
+            self.output.resume()
+            self.clock.start()
+            self.playing = True
+            self.paused = False
+            self._cond.notify_all()
+
+    def resume(self):
+        """Continue from where pause() stopped, keeping the queued audio"""
+        if not self.paused:
+            return
+        with self._cond:
+            self.output.resume()
+            self.clock.start()
+            self.paused = False
+            self._cond.notify_all()
+
     def pause(self):
-        self.current_position = pygame.mixer.music.get_pos() / 1000.0  # Convert to seconds
-        pygame.mixer.music.pause()
-        self.paused = True
-    
-    def stop(self):
-        pygame.mixer.music.stop()
-        self.playing = False
-        self.paused = False
-        self.current_position = 0
-    
-    def cleanup(self):
-        pygame.mixer.music.stop()
-        pygame.mixer.quit()
+        with self._cond:
+            self.output.pause()
+            self.clock.pause()
+            self.current_position = self.clock.position
+            self.paused = True
 
+    def seek(self, position: float):
+        """Move playback to ``position`` seconds, keeping the play/pause state"""
+        position = max(0.0, min(position, self.duration))
+        with self._cond:
+            self._move_to(position)
+            self._cond.notify_all()
 
+    def stop(self):
+        with self._cond:
+            self.playing = False
+            self.paused = False
+            self.clock.pause()
+            self._move_to(0)
+            self.output.resume()
+
+    def cleanup(self):
+        self.stop()
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._feeder.join(timeout=1.0)
+        self.output.close()
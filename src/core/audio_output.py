@@ -0,0 +1,204 @@
+import threading
+import time
+import numpy as np
+from typing import Optional
+
+
+class AudioOutput:
+    """Destination for blocks of float32 PCM produced by the AudioEngine.
+
+    The engine's feeder thread calls ``wait`` until the output can take
+    another block and then ``write`` with a ``(frames, channels)`` array.
+    ``write`` must not block; all pacing happens in ``wait`` so the engine
+    can seek or pause while the feeder is waiting.
+    """
+
+    def open(self, sample_rate: int, channels: int):
+        self.sample_rate = sample_rate
+        self.channels = channels
+
+    def wait(self):
+        """Block until the output can accept another block"""
+
+    def write(self, block: np.ndarray):
+        raise NotImplementedError
+
+    def pause(self):
+        pass
+
+    def resume(self):
+        pass
+
+    def flush(self):
+        """Drop every block that has been written but not played yet"""
+
+    def close(self):
+        pass
+
+
+class PygameOutput(AudioOutput):
+    """Plays PCM blocks as ``pygame.mixer.Sound`` buffers queued on one channel.
+
+    One block plays while the next one waits in the channel queue, so
+    SDL_mixer switches between them without a gap. Seeking only drops the
+    queued buffers; the file is never reopened or decoded again.
+    """
+
+    def __init__(self, buffer_size: int = 2048, poll_interval: float = 0.002):
+        self.buffer_size = buffer_size
+        self.poll_interval = poll_interval
+        self.channel = None
+        # Buffer size the mixer was last opened with; get_init() doesn't report it
+        self._mixer_buffer = None
+
+    def open(self, sample_rate: int, channels: int):
+        super().open(sample_rate, channels)
+        self.mixer_channels = min(channels, 2)
+        # Imported on first use; pygame takes a while to load
+        import pygame
+        if (pygame.mixer.get_init() != (sample_rate, -16, self.mixer_channels)
+                or self._mixer_buffer != self.buffer_size):
+            pygame.mixer.quit()
+            pygame.mixer.init(frequency=sample_rate, size=-16,
+                              channels=self.mixer_channels, buffer=self.buffer_size)
+            pygame.mixer.set_reserved(1)
+            self._mixer_buffer = self.buffer_size
+        self.channel = pygame.mixer.Channel(0)
+
+    def wait(self):
+        while self.channel is not None and self.channel.get_queue() is not None:
+            time.sleep(self.poll_interval)
+
+    def write(self, block: np.ndarray):
+        import pygame
+        pcm = np.clip(block[:, :self.mixer_channels], -1.0, 1.0)
+        sound = pygame.mixer.Sound(buffer=(pcm * 32767).astype(np.int16).tobytes())
+        if self.channel.get_busy():
+            self.channel.queue(sound)
+        else:
+            self.channel.play(sound)
+
+    def pause(self):
+        if self.channel is not None:
+            self.channel.pause()
+
+    def resume(self):
+        if self.channel is not None:
+            self.channel.unpause()
+
+    def flush(self):
+        if self.channel is not None:
+            # Stopping starts the queued sound, so stop twice to drop it too
+            self.channel.stop()
+            self.channel.stop()
+
+    def close(self):
+        self.flush()
+        if self.channel is not None:
+            import pygame
+            pygame.mixer.quit()
+        self.channel = None
+        self._mixer_buffer = None
+
+
+class NullOutput(AudioOutput):
+    """Discards PCM but consumes it in real time.
+
+    Useful for running the engine and benchmarks on machines without a
+    sound card: the playback clock advances exactly as it would with a
+    real device buffering ``latency`` seconds ahead.
+    """
+
+    def __init__(self, latency: float = 0.1):
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._started: Optional[float] = None
+        self._paused_at: Optional[float] = None
+        self._written = 0
+
+    def open(self, sample_rate: int, channels: int):
+        super().open(sample_rate, channels)
+        self.flush()
+
+    def _buffered(self, now: float) -> float:
+        if self._started is None:
+            return 0.0
+        played = (self._paused_at or now) - self._started
+        return self._written / self.sample_rate - played
+
+    def wait(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                ahead = self._buffered(now) - self.latency
+                if self._paused_at is not None or ahead <= 0:
+                    return
+            time.sleep(max(0.001, min(ahead, 0.01)))
+
+    def write(self, block: np.ndarray):
+        with self._lock:
+            if self._started is None:
+                self._started = time.monotonic()
+            self._written += len(block)
+
+    def pause(self):
+        with self._lock:
+            if self._paused_at is None:
+                self._paused_at = time.monotonic()
+
+    def resume(self):
+        with self._lock:
+            if self._paused_at is not None:
+                if self._started is not None:
+                    self._started += time.monotonic() - self._paused_at
+                self._paused_at = None
+
+    def flush(self):
+        with self._lock:
+            self._started = None
+            self._written = 0
+
+
+class WavFileOutput(AudioOutput):
+    """Writes everything the engine plays to a 16-bit WAV file.
+
+    With ``realtime`` False blocks are accepted as fast as they can be
+    produced, which makes it suitable for offline rendering and CI runs.
+    """
+
+    def __init__(self, path: str, realtime: bool = False):
+        self.path = path
+        self.realtime = realtime
+        self._file = None
+        self._pacer = NullOutput() if realtime else None
+
+    def open(self, sample_rate: int, channels: int):
+        super().open(sample_rate, channels)
+        self.close()
+        import soundfile as sf
+        self._file = sf.SoundFile(self.path, 'w', samplerate=sample_rate,
+                                  channels=channels, subtype='PCM_16')
+        if self._pacer is not None:
+            self._pacer.open(sample_rate, channels)
+
+    def wait(self):
+        if self._pacer is not None:
+            self._pacer.wait()
+
+    def write(self, block: np.ndarray):
+        self._file.write(block)
+        if self._pacer is not None:
+            self._pacer.write(block)
+
+    def pause(self):
+        if self._pacer is not None:
+            self._pacer.pause()
+
+    def resume(self):
+        if self._pacer is not None:
+            self._pacer.resume()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
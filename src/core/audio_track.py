@@ -0,0 +1,212 @@
+import threading
+import numpy as np
+from typing import Callable, Optional, Tuple
+
+# Files longer than this are streamed from disk instead of decoded up front
+STREAMING_THRESHOLD_SECONDS = 20 * 60
+DECODE_BLOCK_FRAMES = 65536
+# Samples quieter than this (-90 dBFS) count as digital silence
+SILENCE_THRESHOLD = 10 ** (-90 / 20)
+
+ProgressCallback = Callable[[float], None]
+
+
+def decode_blocks(sound_file: 'soundfile.SoundFile', out: np.ndarray,
+                  progress: Optional[ProgressCallback] = None) -> int:
+    """Decode ``sound_file`` into ``out`` block by block and return the frame count.
+
+    ``progress`` is called with the decoded fraction after every block.
+    """
+    total = len(out)
+    pos = 0
+    for block in sound_file.blocks(blocksize=DECODE_BLOCK_FRAMES, dtype='float32', always_2d=True):
+        n = min(len(block), total - pos)
+        out[pos:pos + n] = block[:n]
+        pos += n
+        if progress is not None and total:
+            progress(pos / total)
+    return pos
+
+
+class AudioTrack:
+    """Decoded PCM for one audio file.
+
+    The track is decoded exactly once and then shared read-only between the
+    audio engine, the time labels and the visualizer. ``data`` is always a
+    float32 array shaped ``(frames, channels)`` so consumers can slice it
+    without copying or reshaping.
+    """
+
+    streaming = False
+
+    def __init__(self, data: np.ndarray, sample_rate: int, path: Optional[str] = None):
+        self.data = data
+        self.sample_rate = sample_rate
+        self.path = path
+        # Precomputed SpectralIndex, PeakPyramid and LoudnessResult,
+        # attached by prepare_track
+        self.analysis = None
+        self.peaks = None
+        self.loudness = None
+
+    @classmethod
+    def load(cls, file_path: str, progress: Optional[ProgressCallback] = None) -> 'AudioTrack':
+        """Decode ``file_path`` into a new track"""
+        import soundfile as sf
+        with sf.SoundFile(file_path) as f:
+            data = np.empty((f.frames, f.channels), dtype=np.float32)
+            frames = decode_blocks(f, data, progress)
+            return cls(data[:frames], f.samplerate, file_path)
+
+    @staticmethod
+    def open(file_path: str, streaming: Optional[bool] = None, cache=None,
+             progress: Optional[ProgressCallback] = None):
+        """Open ``file_path`` either fully decoded or as a streaming track.
+
+        With a ``PCMCache`` the track is served memory-mapped from the cache,
+        decoding into it on a miss. Otherwise, when ``streaming`` is None the
+        choice is made from the duration reported by ``sf.info``, so long
+        mixes never get decoded in full.
+        """
+        if cache is not None and not streaming:
+            track = cache.load(file_path, progress)
+            if track is not None:
+                return track
+        if streaming is None:
+            import soundfile as sf
+            streaming = sf.info(file_path).duration > STREAMING_THRESHOLD_SECONDS
+        if streaming:
+            return StreamingAudioTrack(file_path)
+        return AudioTrack.load(file_path, progress)
+
+    @property
+    def frames(self) -> int:
+        return len(self.data)
+
+    @property
+    def channels(self) -> int:
+        return self.data.shape[1]
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.sample_rate if self.sample_rate else 0.0
+
+    def read(self, start: int, frames: int) -> np.ndarray:
+        """Return up to ``frames`` frames from ``start`` as a view"""
+        start = max(0, start)
+        return self.data[start:start + frames]
+
+    def trim(self, start: int, end: int):
+        """Restrict the track to frames ``start:end`` without copying"""
+        self.data = self.data[start:end]
+
+    def close(self):
+        pass
+
+
+class StreamingAudioTrack:
+    """Audio file decoded block by block around the playhead.
+
+    Only a fixed-size window of decoded frames is kept in memory, so memory
+    use does not depend on the length of the file. Reads that fall outside
+    the window move it, decoding from the new position with
+    ``soundfile.SoundFile`` block reads into a preallocated buffer.
+    """
+
+    streaming = True
+
+    def __init__(self, file_path: str, window_seconds: float = 10.0):
+        import soundfile as sf
+        info = sf.info(file_path)
+        self.path = file_path
+        self.sample_rate = info.samplerate
+        self.channels = info.channels
+        self.frames = info.frames
+        self.duration = info.duration
+        self.analysis = None
+        self.peaks = None
+        self.loudness = None
+        self._offset = 0
+
+        self._file = sf.SoundFile(file_path)
+        self._lock = threading.Lock()
+        window_frames = int(window_seconds * self.sample_rate)
+        self._window = np.zeros((window_frames, self.channels), dtype=np.float32)
+        self._window_start = 0
+        self._window_len = 0
+
+    def _fill_window(self, start: int):
+        # Keep a little history behind the requested position so readers
+        # trailing the playback feeder (the visualizer) stay inside the window
+        start = max(0, start - len(self._window) // 8)
+        self._file.seek(start)
+        block = self._file.read(len(self._window), dtype='float32',
+                                always_2d=True, out=self._window)
+        self._window_start = start
+        self._window_len = len(block)
+
+    def read(self, start: int, frames: int) -> np.ndarray:
+        """Return up to ``frames`` frames from ``start`` as a new array"""
+        start = max(0, start)
+        frames = max(0, min(frames, self.frames - start))
+        start += self._offset
+        if frames > len(self._window):
+            with self._lock:
+                self._file.seek(start)
+                return self._file.read(frames, dtype='float32', always_2d=True)
+
+        with self._lock:
+            offset = start - self._window_start
+            if offset < 0 or offset + frames > self._window_len:
+                self._fill_window(start)
+                offset = start - self._window_start
+            return self._window[offset:offset + frames].copy()
+
+    def clone(self) -> 'StreamingAudioTrack':
+        """Independent reader over the same range, for background scans"""
+        reader = StreamingAudioTrack(self.path, window_seconds=1.0)
+        reader.trim(self._offset, self._offset + self.frames)
+        return reader
+
+    def trim(self, start: int, end: int):
+        """Restrict the track to frames ``start:end`` of the current range"""
+        self._offset += start
+        self.frames = end - start
+        self.duration = self.frames / self.sample_rate
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def silence_bounds(track, threshold: float = SILENCE_THRESHOLD,
+                   max_scan_seconds: float = 30.0) -> Tuple[int, int]:
+    """Return the ``(start, end)`` frames of ``track`` without leading and trailing silence.
+
+    Only the first and last ``max_scan_seconds`` are inspected, so this is
+    cheap for streaming tracks too. A track that is silent throughout is
+    left untouched.
+    """
+    scan = min(track.frames, int(max_scan_seconds * track.sample_rate))
+    head = np.abs(track.read(0, scan)).max(axis=1)
+    loud = np.flatnonzero(head > threshold)
+    if len(loud) == 0:
+        if scan == track.frames:
+            return 0, track.frames
+        start = scan
+    else:
+        start = int(loud[0])
+
+    tail_start = max(start, track.frames - scan)
+    tail = np.abs(track.read(tail_start, track.frames - tail_start)).max(axis=1)
+    loud = np.flatnonzero(tail > threshold)
+    end = tail_start + int(loud[-1]) + 1 if len(loud) else track.frames
+    return start, end
+
+
+def trim_silence(track, threshold: float = SILENCE_THRESHOLD):
+    """Trim leading and trailing digital silence from ``track`` in place"""
+    start, end = silence_bounds(track, threshold)
+    if start > 0 or end < track.frames:
+        track.trim(start, end)
+    return track
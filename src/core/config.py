@@ -1,19 +1,66 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 import json
 from pathlib import Path
 
+DEFAULT_PROFILE = 'balanced'
+
+# Settings each performance profile overrides; 'balanced' matches the
+# defaults below. Embedded boxes trade frame rate, frequency resolution
+# and particles for CPU time; workstations get the opposite.
+PERFORMANCE_PROFILES = {
+    'low-power': dict(update_interval=33, buffer_size=4096, chunk_size=1024,
+                      num_bars=32, num_circular_bars=32,
+                      max_particles=60, max_ring_particles=90),
+    'balanced': dict(update_interval=16, buffer_size=2048, chunk_size=2048,
+                     num_bars=64, num_circular_bars=32,
+                     max_particles=200, max_ring_particles=300),
+    'high-fidelity': dict(update_interval=8, buffer_size=1024, chunk_size=4096,
+                          num_bars=128, num_circular_bars=128,
+                          max_particles=400, max_ring_particles=600),
+}
+
 @dataclass
 class AudioPlayerConfig:
+    # The size the main window has always opened at
     window_width: int = 1000
-    window_height: int = 500
+    window_height: int = 700
+    # Milliseconds between rendered frames
     update_interval: int = 16
-    buffer_size: int = 8192
+    # Mixer buffer in sample frames; PygameOutput's default, which the
+    # player used before it read this setting
+    buffer_size: int = 2048
     supported_formats: tuple = ('.mp3', '.wav', '.ogg')
+    profile: str = DEFAULT_PROFILE
+    # Samples per analysis chunk (the FFT size)
+    chunk_size: int = 2048
+    num_bars: int = 64
+    num_circular_bars: int = 32
+    max_particles: int = 200
+    max_ring_particles: int = 300
+    # Settings given explicitly in config.json; they win over any profile
+    overrides: dict = field(default_factory=dict, repr=False)
+
+    @property
+    def fps(self) -> float:
+        return 1000 / self.update_interval
+
+    @property
+    def band_counts(self) -> tuple:
+        """Band counts the visualizations take from the spectral analysis"""
+        return (self.num_bars, self.num_circular_bars)
+
+    def with_profile(self, name: str) -> 'AudioPlayerConfig':
+        """A copy with the settings of performance profile ``name`` and the overrides"""
+        if name not in PERFORMANCE_PROFILES:
+            raise ValueError(f"Unknown performance profile {name!r}")
+        return replace(self, profile=name, **{**PERFORMANCE_PROFILES[name], **self.overrides})
 
 def load_config() -> AudioPlayerConfig:
     config_path = Path('config.json')
     if config_path.exists():
         with open(config_path) as f:
             config_dict = json.load(f)
-            return AudioPlayerConfig(**config_dict)
+            # The named profile first, then any setting given explicitly
+            profile = config_dict.pop('profile', DEFAULT_PROFILE)
+            return AudioPlayerConfig(overrides=config_dict).with_profile(profile)
     return AudioPlayerConfig()
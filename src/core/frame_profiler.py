@@ -0,0 +1,124 @@
+from collections import deque
+from contextlib import contextmanager
+import json
+import platform
+import time
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+
+# Samples kept per stage; about ten seconds at 60 fps
+DEFAULT_WINDOW = 600
+# Histogram bucket edges in milliseconds; the last bucket is open-ended
+HISTOGRAM_EDGES_MS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33, 66)
+
+# Stages in pipeline order, as shown in the HUD
+STAGES = (
+    'timer jitter',
+    'chunk fetch',
+    'channel mixdown',
+    'index lookup',
+    'fft',
+    'band reduction',
+    'artist update',
+    'draw',
+)
+
+
+class FrameProfiler:
+    """Rolling per-stage timings of the frame pipeline.
+
+    Stages record durations in nanoseconds from ``time.perf_counter_ns``.
+    Each stage keeps the last ``window`` samples, so statistics describe
+    recent behaviour rather than the whole session. Recording is a deque
+    append and is safe from the analysis worker thread as well as the GUI
+    thread.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.window = window
+        self.enabled = True
+        self._samples: Dict[str, deque] = {}
+        self._counts: Dict[str, int] = {}
+
+    def record(self, stage: str, nanoseconds: int):
+        if not self.enabled:
+            return
+        samples = self._samples.get(stage)
+        if samples is None:
+            samples = self._samples.setdefault(stage, deque(maxlen=self.window))
+        samples.append(nanoseconds)
+        self._counts[stage] = self._counts.get(stage, 0) + 1
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the body of a ``with`` block as ``name``"""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter_ns() - start)
+
+    def reset(self):
+        self._samples.clear()
+        self._counts.clear()
+
+    def stage_names(self):
+        """Recorded stages, known ones first in pipeline order"""
+        known = [name for name in STAGES if name in self._samples]
+        return known + sorted(name for name in self._samples if name not in STAGES)
+
+    def stats(self, stage: str) -> Optional[dict]:
+        """Summary of the rolling window of ``stage`` in milliseconds"""
+        samples = self._samples.get(stage)
+        if not samples:
+            return None
+        # copy() runs without releasing the GIL, so the worker cannot append mid-read
+        ms = np.array(samples.copy(), dtype=np.float64) / 1e6
+        p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+        histogram = np.histogram(ms, bins=(0,) + HISTOGRAM_EDGES_MS + (np.inf,))[0]
+        return {
+            'samples': len(ms),
+            'total_samples': self._counts.get(stage, len(ms)),
+            'mean': float(ms.mean()),
+            'p50': float(p50),
+            'p95': float(p95),
+            'p99': float(p99),
+            'max': float(ms.max()),
+            'histogram': histogram.tolist(),
+        }
+
+    def snapshot(self, extra: Optional[dict] = None) -> dict:
+        """Every stage's statistics plus enough context to compare builds"""
+        data = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'window': self.window,
+            'histogram_edges_ms': list(HISTOGRAM_EDGES_MS),
+            'stages': {name: self.stats(name) for name in self.stage_names()},
+        }
+        if extra:
+            data.update(extra)
+        return data
+
+    def dump_json(self, path, extra: Optional[dict] = None):
+        with open(path, 'w') as f:
+            json.dump(self.snapshot(extra), f, indent=2)
+
+
+class _NullProfiler:
+    """Stands in when no profiler is attached; costs one call per stage"""
+
+    enabled = False
+
+    def record(self, stage, nanoseconds):
+        pass
+
+    @contextmanager
+    def stage(self, name):
+        yield
+
+
+NULL_PROFILER = _NullProfiler()
@@ -0,0 +1,319 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import os
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Callable, Iterable, List, Optional, Sequence
+
+from src.core.config import AudioPlayerConfig
+
+DEFAULT_LIBRARY_PATH = Path.home() / '.cache' / 'audio-player' / 'library.sqlite3'
+# Threads reading sf.info; the work is file I/O, so more than the core count
+DEFAULT_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Rows written per transaction while scanning
+_BATCH_SIZE = 500
+
+# ORDER BY clause per sort column; each matches an index (which ends in
+# the rowid), so a page is read straight from the index without sorting
+SORT_ORDERS = {
+    'title': 'title COLLATE NOCASE {0}, id {0}',
+    'folder': 'folder COLLATE NOCASE {0}, title COLLATE NOCASE {0}, id {0}',
+    'duration': 'duration {0}, id {0}',
+    'sample_rate': 'sample_rate {0}, id {0}',
+    'format': 'format {0}, id {0}',
+    'mtime_ns': 'mtime_ns {0}, id {0}',
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracks (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    folder TEXT NOT NULL,
+    title TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    duration REAL,
+    sample_rate INTEGER,
+    channels INTEGER,
+    format TEXT,
+    subtype TEXT
+);
+CREATE INDEX IF NOT EXISTS tracks_mtime ON tracks (mtime_ns);
+CREATE INDEX IF NOT EXISTS tracks_title ON tracks (title COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS tracks_folder ON tracks (folder COLLATE NOCASE, title COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS tracks_duration ON tracks (duration);
+CREATE INDEX IF NOT EXISTS tracks_sample_rate ON tracks (sample_rate);
+CREATE INDEX IF NOT EXISTS tracks_format ON tracks (format);
+CREATE TABLE IF NOT EXISTS roots (path TEXT PRIMARY KEY);
+-- Files libsndfile could not read, so rescans skip them until they change
+CREATE TABLE IF NOT EXISTS unreadable (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+"""
+
+# Substring search through a trigram index, kept in sync by triggers
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS tracks_fts USING fts5(
+    title, folder, content='tracks', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS tracks_ai AFTER INSERT ON tracks BEGIN
+    INSERT INTO tracks_fts (rowid, title, folder) VALUES (new.id, new.title, new.folder);
+END;
+CREATE TRIGGER IF NOT EXISTS tracks_ad AFTER DELETE ON tracks BEGIN
+    INSERT INTO tracks_fts (tracks_fts, rowid, title, folder)
+    VALUES ('delete', old.id, old.title, old.folder);
+END;
+CREATE TRIGGER IF NOT EXISTS tracks_au AFTER UPDATE ON tracks BEGIN
+    INSERT INTO tracks_fts (tracks_fts, rowid, title, folder)
+    VALUES ('delete', old.id, old.title, old.folder);
+    INSERT INTO tracks_fts (rowid, title, folder) VALUES (new.id, new.title, new.folder);
+END;
+"""
+
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclass
+class LibraryTrack:
+    """One row of the library"""
+    path: str
+    folder: str
+    title: str
+    duration: Optional[float]
+    sample_rate: Optional[int]
+    channels: Optional[int]
+    format: Optional[str]
+
+
+@dataclass
+class ScanResult:
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+
+def _read_metadata(entry):
+    # Runs on the scan pool; libsndfile releases the GIL while reading
+    import soundfile as sf
+    path, size, mtime_ns = entry
+    try:
+        info = sf.info(path)
+    except (RuntimeError, OSError):
+        return entry, None
+    return entry, (path, os.path.dirname(path), Path(path).stem, size, mtime_ns,
+                   info.duration, info.samplerate, info.channels, info.format, info.subtype)
+
+
+class MusicLibrary:
+    """Audio files under a set of folders, indexed in SQLite.
+
+    Scans walk the folders with ``os.scandir`` and compare each file's size
+    and mtime with the stored row, so a rescan only reads metadata of new
+    or changed files, in a thread pool, and drops rows of deleted ones.
+    Searching is a trigram full-text lookup (a LIKE scan where SQLite lacks
+    FTS5) and every sort column is indexed, so queries return a page of
+    rows quickly however large the library is.
+
+    Each thread gets its own connection; the database runs in WAL mode, so
+    the UI can query while a scan writes.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None, formats: Optional[Sequence[str]] = None):
+        self.db_path = Path(db_path) if db_path else DEFAULT_LIBRARY_PATH
+        self.formats = tuple(f.lower() for f in (formats or AudioPlayerConfig().supported_formats))
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self.full_text = self._create_schema(self._connection())
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _create_schema(connection) -> bool:
+        """Create missing tables; returns whether full-text search is available"""
+        with connection:
+            connection.executescript(_SCHEMA)
+            try:
+                connection.executescript(_FTS_SCHEMA)
+                return True
+            except sqlite3.OperationalError:
+                return False
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    # Folders
+
+    def roots(self) -> List[str]:
+        return [row[0] for row in self._connection().execute('SELECT path FROM roots ORDER BY path')]
+
+    def add_root(self, folder: str):
+        with self._connection() as connection:
+            connection.execute('INSERT OR IGNORE INTO roots (path) VALUES (?)',
+                               (os.path.abspath(folder),))
+
+    def remove_root(self, folder: str):
+        """Forget ``folder`` and every track found under it"""
+        folder = os.path.abspath(folder)
+        with self._connection() as connection:
+            connection.execute('DELETE FROM roots WHERE path = ?', (folder,))
+            for table in ('tracks', 'unreadable'):
+                connection.execute(f'DELETE FROM {table} WHERE path >= ? AND path < ?',
+                                   _prefix_range(folder))
+
+    # Scanning
+
+    def _walk(self, folder: str):
+        """``(path, size, mtime_ns)`` of every supported file below ``folder``"""
+        pending = [folder]
+        while pending:
+            try:
+                entries = os.scandir(pending.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.name.lower().endswith(self.formats) and entry.is_file():
+                            stat = entry.stat()
+                            yield entry.path, stat.st_size, stat.st_mtime_ns
+                    except OSError:
+                        continue
+
+    def scan(self, folders: Optional[Iterable[str]] = None, progress: Optional[ProgressCallback] = None,
+             cancelled: Optional[Callable[[], bool]] = None,
+             workers: int = DEFAULT_SCAN_WORKERS) -> ScanResult:
+        """Bring the library up to date with ``folders`` (default: all roots).
+
+        ``progress(done, total)`` counts files whose metadata had to be read.
+        """
+        started = time.perf_counter()
+        connection = self._connection()
+        result = ScanResult()
+        folders = [os.path.abspath(f) for f in folders] if folders is not None else self.roots()
+
+        for folder in folders:
+            known = {}
+            for table in ('tracks', 'unreadable'):
+                for path, size, mtime in connection.execute(
+                        f'SELECT path, size, mtime_ns FROM {table} WHERE path >= ? AND path < ?',
+                        _prefix_range(folder)):
+                    known[path] = (size, mtime)
+            changed = []
+            for path, size, mtime_ns in self._walk(folder):
+                previous = known.pop(path, None)
+                if previous == (size, mtime_ns):
+                    result.unchanged += 1
+                    continue
+                changed.append((path, size, mtime_ns))
+                if previous is None:
+                    result.added += 1
+                else:
+                    result.updated += 1
+
+            # Whatever was not seen on disk is gone
+            with connection:
+                for table in ('tracks', 'unreadable'):
+                    connection.executemany(f'DELETE FROM {table} WHERE path = ?',
+                                           ((p,) for p in known))
+            result.removed += len(known)
+
+            if changed:
+                self._read_changed(connection, changed, result, progress, cancelled, workers)
+            if cancelled is not None and cancelled():
+                break
+
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def _read_changed(self, connection, changed, result, progress, cancelled, workers):
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='library-scan') as pool:
+            for start in range(0, len(changed), _BATCH_SIZE):
+                results = list(pool.map(_read_metadata, changed[start:start + _BATCH_SIZE]))
+                rows = [row for _, row in results if row is not None]
+                failed = [entry for entry, row in results if row is None]
+                result.failed += len(failed)
+                self._store(connection, rows, failed)
+                if progress is not None:
+                    progress(start + len(results), len(changed))
+                if cancelled is not None and cancelled():
+                    return
+
+    @staticmethod
+    def _store(connection, rows, failed=()):
+        with connection:
+            connection.executemany('DELETE FROM unreadable WHERE path = ?',
+                                   ((row[0],) for row in rows))
+            connection.executemany('DELETE FROM tracks WHERE path = ?', ((f[0],) for f in failed))
+            connection.executemany('INSERT OR REPLACE INTO unreadable (path, size, mtime_ns) '
+                                   'VALUES (?, ?, ?)', failed)
+            connection.executemany("""
+                INSERT INTO tracks (path, folder, title, size, mtime_ns, duration,
+                                    sample_rate, channels, format, subtype)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (path) DO UPDATE SET
+                    size = excluded.size, mtime_ns = excluded.mtime_ns,
+                    duration = excluded.duration, sample_rate = excluded.sample_rate,
+                    channels = excluded.channels, format = excluded.format,
+                    subtype = excluded.subtype
+            """, rows)
+
+    # Queries
+
+    def _where(self, query: str):
+        query = query.strip()
+        if not query:
+            return '', ()
+        if self.full_text and len(query) >= 3:
+            # Quoted so the words are matched as a literal substring
+            phrase = '"' + query.replace('"', '""') + '"'
+            return 'WHERE id IN (SELECT rowid FROM tracks_fts WHERE tracks_fts MATCH ?)', (phrase,)
+        pattern = '%' + query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        return ("WHERE title LIKE ? ESCAPE '\\' OR folder LIKE ? ESCAPE '\\'", (pattern, pattern))
+
+    def count(self, query: str = '') -> int:
+        where, params = self._where(query)
+        return self._connection().execute(f'SELECT COUNT(*) FROM tracks {where}', params).fetchone()[0]
+
+    def search(self, query: str = '', sort: str = 'title', descending: bool = False,
+               limit: int = 200, offset: int = 0) -> List[LibraryTrack]:
+        """One page of tracks matching ``query``, ordered by ``sort``"""
+        if sort not in SORT_ORDERS:
+            raise ValueError(f"Cannot sort by {sort!r}")
+        where, params = self._where(query)
+        order = SORT_ORDERS[sort].format('DESC' if descending else 'ASC')
+        rows = self._connection().execute(f"""
+            SELECT path, folder, title, duration, sample_rate, channels, format FROM tracks
+            {where} ORDER BY {order} LIMIT ? OFFSET ?
+        """, params + (limit, offset))
+        return [LibraryTrack(*row) for row in rows]
+
+    def paths(self, query: str = '') -> List[str]:
+        """Paths of every track matching ``query``"""
+        where, params = self._where(query)
+        return [row[0] for row in self._connection().execute(f'SELECT path FROM tracks {where}', params)]
+
+
+def _prefix_range(folder: str):
+    # Paths below ``folder`` sort between these two strings, so the unique
+    # index on path answers the range without scanning the table
+    prefix = os.path.join(folder, '')
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
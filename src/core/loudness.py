@@ -0,0 +1,320 @@
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+import numpy as np
+
+from src.core.pcm_cache import file_key
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'audio-player' / 'loudness'
+# Bumped whenever the measurement changes, so old cache entries are ignored
+LOUDNESS_VERSION = 1
+
+# Playback level the engine normalizes to, and the highest peak it allows
+DEFAULT_TARGET_LUFS = -18.0
+DEFAULT_PEAK_CEILING_DBTP = -1.0
+MAX_GAIN_DB = 12.0
+
+ABSOLUTE_GATE_LUFS = -70.0
+RELATIVE_GATE_LU = -10.0
+# 400 ms gating blocks overlapping by 75%, built from 100 ms segments
+SEGMENT_SECONDS = 0.1
+SEGMENTS_PER_BLOCK = 4
+
+# True peak: 4x oversampling with a 48-tap interpolator, 12 taps per phase
+OVERSAMPLING = 4
+TAPS_PER_PHASE = 12
+# Samples per chunk when looking for regions that may hold a new true peak
+_PEAK_CHUNK = 256
+_PEAK_GROUP = 512
+ANALYSIS_BLOCK_FRAMES = 1 << 18
+
+
+@dataclass
+class LoudnessResult:
+    """Integrated loudness in LUFS (None for digital silence) and true peak in dBTP"""
+    integrated: Optional[float]
+    true_peak: float
+    duration: float
+
+    def gain_db(self, target: float = DEFAULT_TARGET_LUFS,
+                ceiling: float = DEFAULT_PEAK_CEILING_DBTP) -> float:
+        """Gain that brings the track to ``target`` without peaks above ``ceiling``"""
+        if self.integrated is None:
+            return 0.0
+        gain = min(target - self.integrated, ceiling - self.true_peak, MAX_GAIN_DB)
+        return float(gain)
+
+
+def _biquad_power(b, a, omega: np.ndarray) -> np.ndarray:
+    z = np.exp(-1j * omega)
+    response = (b[0] + b[1] * z + b[2] * z * z) / (a[0] + a[1] * z + a[2] * z * z)
+    return np.abs(response) ** 2
+
+
+@lru_cache(maxsize=16)
+def k_weighting_power(sample_rate: int, size: int) -> np.ndarray:
+    """Power response of the BS.1770 K-weighting at the rfft bins of ``size``"""
+    omega = 2 * np.pi * np.fft.rfftfreq(size)
+
+    # Stage 1: high shelf, +4 dB above about 1.5 kHz
+    k = np.tan(np.pi * 1681.974450955533 / sample_rate)
+    q = 0.7071752369554196
+    vh = 10 ** (3.999843853973347 / 20)
+    vb = vh ** 0.4996667741545416
+    shelf_b = (vh + vb * k / q + k * k, 2 * (k * k - vh), vh - vb * k / q + k * k)
+    shelf_a = (1 + k / q + k * k, 2 * (k * k - 1), 1 - k / q + k * k)
+
+    # Stage 2: RLB high-pass at about 38 Hz
+    k = np.tan(np.pi * 38.13547087602444 / sample_rate)
+    q = 0.5003270373238773
+    high_pass_b = (1.0, -2.0, 1.0)
+    high_pass_a = (1.0, 2 * (k * k - 1) / (1 + k / q + k * k), (1 - k / q + k * k) / (1 + k / q + k * k))
+
+    power = _biquad_power(shelf_b, shelf_a, omega) * _biquad_power(high_pass_b, high_pass_a, omega)
+    # Parseval weights turn the weighted spectrum into a mean square
+    parseval = np.full(len(omega), 2.0)
+    parseval[0] = 1.0
+    if size % 2 == 0:
+        parseval[-1] = 1.0
+    return power * parseval / (size * size)
+
+
+@lru_cache(maxsize=1)
+def _interpolation_kernels() -> np.ndarray:
+    """Windowed-sinc kernels for the fractional phases 1/4, 2/4 and 3/4"""
+    taps = np.arange(TAPS_PER_PHASE) - (TAPS_PER_PHASE // 2 - 1)
+    kernels = []
+    for phase in range(1, OVERSAMPLING):
+        t = taps - phase / OVERSAMPLING
+        window = 0.5 + 0.5 * np.cos(np.pi * t / (TAPS_PER_PHASE / 2 + 1))
+        kernels.append(np.sinc(t) * window)
+    return np.array(kernels)
+
+
+def channel_weights(channels: int) -> np.ndarray:
+    """BS.1770 channel weights: surrounds count 1.41, the LFE not at all"""
+    if channels == 5:
+        return np.array([1.0, 1.0, 1.0, 1.41, 1.41])
+    if channels == 6:
+        return np.array([1.0, 1.0, 1.0, 0.0, 1.41, 1.41])
+    return np.ones(channels)
+
+
+class LoudnessMeter:
+    """Streaming EBU R128 integrated loudness and true-peak meter.
+
+    Audio is fed in blocks of any size. Each complete 100 ms segment is
+    K-weighted in the frequency domain, with one rfft per segment and
+    channel for the whole block at once. The 400 ms gating blocks are then
+    sums of four segment energies, so the gating in ``result()`` is plain
+    array arithmetic. True peak comes from 4x oversampling with short
+    windowed-sinc kernels.
+    """
+
+    def __init__(self, sample_rate: int, channels: int):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.segment = max(1, int(round(sample_rate * SEGMENT_SECONDS)))
+        self.weights = channel_weights(channels)
+        self.frames = 0
+        self._energies = []
+        self._pending = np.zeros((0, channels), dtype=np.float32)
+        self._history = np.zeros((TAPS_PER_PHASE - 1, channels), dtype=np.float32)
+        self._peak = 0.0
+
+    def feed(self, block: np.ndarray):
+        block = np.asarray(block, dtype=np.float32)
+        if len(block) == 0:
+            return
+        self.frames += len(block)
+        self._update_peak(block)
+
+        data = np.concatenate((self._pending, block)) if len(self._pending) else block
+        whole = len(data) // self.segment * self.segment
+        self._pending = data[whole:].copy()
+        if whole:
+            # (segments, channels, samples) so one rfft covers the whole block
+            segments = data[:whole].reshape(-1, self.segment, self.channels).transpose(0, 2, 1)
+            spectra = np.fft.rfft(segments, axis=2)
+            power = (spectra.real ** 2 + spectra.imag ** 2) @ k_weighting_power(self.sample_rate,
+                                                                                self.segment)
+            self._energies.append(power @ self.weights)
+
+    def _update_peak(self, block: np.ndarray):
+        self._peak = max(self._peak, float(np.abs(block).max()))
+        data = np.concatenate((self._history, block))
+        self._history = data[-(TAPS_PER_PHASE - 1):]
+        positions = len(data) - (TAPS_PER_PHASE - 1)
+        if positions <= 0:
+            return
+
+        # An interpolated sample is at most the kernel's L1 norm times the
+        # largest sample under it, so only chunks near large samples can
+        # hold a new peak. For most material that is a small fraction.
+        kernels = _interpolation_kernels()
+        threshold = self._peak / np.abs(kernels).sum(axis=1).max()
+        chunks = -(-positions // _PEAK_CHUNK)
+        padded = np.zeros((chunks * _PEAK_CHUNK + TAPS_PER_PHASE - 1, self.channels), dtype=np.float32)
+        padded[:len(data)] = data
+        magnitude = np.abs(padded[:chunks * _PEAK_CHUNK]).max(axis=1).reshape(chunks, _PEAK_CHUNK)
+        hot = magnitude.max(axis=1) >= threshold
+        # Windows reach TAPS_PER_PHASE - 1 samples into the next chunk
+        hot[:-1] |= hot[1:]
+        candidates = np.flatnonzero(hot)
+
+        kernels = kernels.astype(np.float32)
+        offsets = np.arange(_PEAK_CHUNK + TAPS_PER_PHASE - 1)
+        for start in range(0, len(candidates), _PEAK_GROUP):
+            group = candidates[start:start + _PEAK_GROUP]
+            windows = padded[group[:, np.newaxis] * _PEAK_CHUNK + offsets]
+            # Positions past the end are measured with the next block
+            valid = (group[:, np.newaxis] * _PEAK_CHUNK + np.arange(_PEAK_CHUNK)) < positions
+            for kernel in kernels:
+                # Shifted multiply-adds over every chunk of the group at once
+                interpolated = windows[:, :_PEAK_CHUNK] * kernel[0]
+                for tap in range(1, TAPS_PER_PHASE):
+                    interpolated += windows[:, tap:tap + _PEAK_CHUNK] * kernel[tap]
+                interpolated[~valid] = 0
+                self._peak = max(self._peak, float(interpolated.max()), float(-interpolated.min()))
+
+    def result(self) -> LoudnessResult:
+        energies = np.concatenate(self._energies) if self._energies else np.zeros(0)
+        duration = self.frames / self.sample_rate
+        true_peak = 20 * np.log10(self._peak) if self._peak > 0 else -np.inf
+        if len(energies) < SEGMENTS_PER_BLOCK:
+            return LoudnessResult(None, float(true_peak), duration)
+
+        # Mean square of each 400 ms block from its four 100 ms segments
+        cumulative = np.concatenate(([0.0], np.cumsum(energies)))
+        blocks = (cumulative[SEGMENTS_PER_BLOCK:] - cumulative[:-SEGMENTS_PER_BLOCK]) / SEGMENTS_PER_BLOCK
+        with np.errstate(divide='ignore'):
+            loudness = -0.691 + 10 * np.log10(blocks)
+
+        gated = blocks[loudness > ABSOLUTE_GATE_LUFS]
+        if len(gated) == 0:
+            return LoudnessResult(None, float(true_peak), duration)
+        relative_gate = -0.691 + 10 * np.log10(gated.mean()) + RELATIVE_GATE_LU
+        gated = blocks[(loudness > ABSOLUTE_GATE_LUFS) & (loudness > relative_gate)]
+        integrated = -0.691 + 10 * np.log10(gated.mean())
+        return LoudnessResult(float(integrated), float(true_peak), duration)
+
+
+def cached_loudness(path: Optional[str],
+                    cache: Optional['LoudnessCache']) -> Optional[LoudnessResult]:
+    """``cache``'s result for the file at ``path``, or None if it has none"""
+    if cache is None or not path:
+        return None
+    try:
+        return cache.get(path)
+    except OSError:
+        return None
+
+
+def store_loudness(path: Optional[str], result: LoudnessResult,
+                   cache: Optional['LoudnessCache']):
+    """Remember ``result`` for the file at ``path``; a cache that can't be written is skipped"""
+    if cache is None or not path:
+        return
+    try:
+        cache.put(path, result)
+    except OSError:
+        pass
+
+
+def analyze_file(file_path: str) -> LoudnessResult:
+    """Loudness of an audio file, decoded block by block"""
+    import soundfile as sf
+    with sf.SoundFile(file_path) as f:
+        meter = LoudnessMeter(f.samplerate, f.channels)
+        for block in f.blocks(blocksize=ANALYSIS_BLOCK_FRAMES, dtype='float32', always_2d=True):
+            meter.feed(block)
+    return meter.result()
+
+
+class LoudnessCache:
+    """Loudness results stored as small JSON files keyed by file contents"""
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, file_path: str) -> Path:
+        return self.cache_dir / f'{file_key(file_path)}.json'
+
+    def get(self, file_path: str) -> Optional[LoudnessResult]:
+        try:
+            with open(self._path(file_path)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.pop('version', None) != LOUDNESS_VERSION:
+            return None
+        return LoudnessResult(**entry)
+
+    def put(self, file_path: str, result: LoudnessResult):
+        entry = asdict(result)
+        entry['version'] = LOUDNESS_VERSION
+        path = self._path(file_path)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def clear(self):
+        for path in self.cache_dir.glob('*.json'):
+            path.unlink(missing_ok=True)
+
+
+def _analyze_entry(file_path: str):
+    # Runs in a pool process
+    try:
+        return file_path, analyze_file(file_path), None
+    except Exception as e:
+        return file_path, None, str(e)
+
+
+def analyze_files(paths: Iterable[str], cache: Optional[LoudnessCache] = None,
+                  workers: Optional[int] = None,
+                  progress: Optional[Callable[[int, int], None]] = None,
+                  cancelled: Optional[Callable[[], bool]] = None) -> Dict[str, Optional[LoudnessResult]]:
+    """Measure many files in a process pool, skipping ones already cached.
+
+    Every process decodes and measures whole files on its own core; the
+    results are written to ``cache`` from this process. Returns a result
+    (None where a file could not be read) for every path.
+    """
+    results = {}
+    todo = []
+    for path in paths:
+        cached = cache.get(path) if cache is not None else None
+        if cached is not None:
+            results[path] = cached
+        else:
+            todo.append(path)
+    if not todo:
+        return results
+
+    # Only batch analysis needs the process machinery
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    import multiprocessing
+
+    # Spawned, not forked, so calling this from the GUI is safe
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        futures = [pool.submit(_analyze_entry, path) for path in todo]
+        for done, future in enumerate(as_completed(futures), 1):
+            path, result, _ = future.result()
+            results[path] = result
+            if result is not None and cache is not None:
+                cache.put(path, result)
+            if progress is not None:
+                progress(done, len(todo))
+            if cancelled is not None and cancelled():
+                for pending in futures:
+                    pending.cancel()
+                break
+    return results
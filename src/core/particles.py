@@ -0,0 +1,218 @@
+from typing import Optional
+
+import numpy as np
+
+# Most particles a single bar can spawn per frame (max(1, int(value * 3)))
+_MAX_SPAWN_PER_BAR = 3
+# Width that gives a uniform draw unit variance
+_UNIT_VARIANCE = 2 * np.sqrt(3)
+
+
+class ParticleSystem:
+    """Fixed-capacity particles stored as parallel numpy arrays.
+
+    Live particles occupy the first ``count`` slots of every array, oldest
+    first. Spawning appends in one slice assignment (dropping the oldest
+    particles when the system is full), updating is a handful of array
+    operations and dead particles are removed by compacting the arrays
+    with a boolean mask, so the cost per frame does not depend on Python
+    objects per particle. Random numbers for a step come from one batched
+    draw.
+    """
+
+    fields = ('velocity', 'life', 'decay', 'value', 'max_height')
+
+    def __init__(self, capacity: int, rng: Optional[np.random.Generator] = None):
+        self.capacity = capacity
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.count = 0
+        # Positions share one array so renderers get an (n, 2) view for free
+        self._xy = np.zeros((capacity, 2))
+        self._arrays = {name: np.zeros(capacity) for name in self.fields}
+
+    def __len__(self):
+        return self.count
+
+    def __getattr__(self, name):
+        # Live slice of a field, e.g. ``particles.life``
+        arrays = self.__dict__.get('_arrays')
+        if arrays is not None and name in arrays:
+            return arrays[name][:self.count]
+        raise AttributeError(name)
+
+    @property
+    def xy(self) -> np.ndarray:
+        return self._xy[:self.count]
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._xy[:self.count, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._xy[:self.count, 1]
+
+    def clear(self):
+        self.count = 0
+
+    def resize(self, capacity: int):
+        """Change the capacity, keeping the newest particles"""
+        keep = min(self.count, capacity)
+        first = self.count - keep
+        xy = np.zeros((capacity, 2))
+        xy[:keep] = self._xy[first:self.count]
+        self._xy = xy
+        for name, array in self._arrays.items():
+            resized = np.zeros(capacity)
+            resized[:keep] = array[first:self.count]
+            self._arrays[name] = resized
+        self.capacity = capacity
+        self.count = keep
+
+    def _append(self, xy: np.ndarray, **values):
+        """Add particles, dropping the oldest ones beyond the capacity"""
+        new = min(len(xy), self.capacity)
+        xy = xy[-new:] if new else xy[:0]
+        overflow = self.count + new - self.capacity
+        if overflow > 0:
+            self._shift(overflow)
+        end = self.count + new
+        self._xy[self.count:end] = xy
+        for name in self.fields:
+            self._arrays[name][self.count:end] = values[name][-new:] if new else 0
+        self.count = end
+
+    def _shift(self, n: int):
+        # Move the newest particles to the front, forgetting the first n
+        keep = self.count - n
+        self._xy[:keep] = self._xy[n:self.count]
+        for array in self._arrays.values():
+            array[:keep] = array[n:self.count]
+        self.count = keep
+
+    def _cull(self):
+        alive = self.life > 0
+        keep = int(np.count_nonzero(alive))
+        if keep == self.count:
+            return
+        self._xy[:keep] = self._xy[:self.count][alive]
+        for array in self._arrays.values():
+            array[:keep] = array[:self.count][alive]
+        self.count = keep
+
+    def sizes(self, scale: float = 30) -> np.ndarray:
+        """Marker areas that shrink as particles fade"""
+        return scale * self.value * self.life ** 0.3
+
+    def alphas(self) -> np.ndarray:
+        return np.maximum(0.2, self.life * 0.8)
+
+    @staticmethod
+    def spawn_counts(values: np.ndarray, last_values: np.ndarray, chance: np.ndarray,
+                     random_rate: float = 0.3):
+        """How many particles each bar spawns, and whether it peaked.
+
+        A bar that rises past 0.15 and by more than 10% spawns up to three
+        particles. Other bars above 0.05 spawn one with a chance that grows
+        with their height.
+        """
+        is_peak = (values > 0.15) & (values > last_values * 1.1)
+        random_spawn = ~is_peak & (chance < values * random_rate) & (values > 0.05)
+        counts = np.where(is_peak, np.maximum(1, (values * _MAX_SPAWN_PER_BAR).astype(int)),
+                          random_spawn.astype(int))
+        return counts, is_peak
+
+
+class BarParticles(ParticleSystem):
+    """Particles rising out of the tops of the bars"""
+
+    fields = ParticleSystem.fields + ('x_velocity',)
+
+    def spawn(self, values: np.ndarray, last_values: np.ndarray):
+        """Spawn particles from ``values`` (bar heights) and step all of them"""
+        # One draw: spawn chance plus velocity and drift for every possible particle
+        draws = self.rng.random((len(values), 1 + 2 * _MAX_SPAWN_PER_BAR))
+        counts, is_peak = self.spawn_counts(values, last_values, draws[:, 0])
+
+        total = int(counts.sum())
+        if total:
+            bars = np.repeat(np.arange(len(values)), counts)
+            # Index of each new particle within its bar picks its random numbers
+            nth = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            peak = is_peak[bars]
+            height = values[bars]
+            # Random spawns are dimmer, slower and fade faster
+            value = height * np.where(peak, 1.0, 0.8)
+            velocity = (0.1 + draws[bars, 1 + 2 * nth] * 0.1) * value * np.where(peak, 1.0, 0.7)
+            xy = np.column_stack((bars.astype(float), height))
+            self._append(
+                xy,
+                velocity=velocity,
+                life=np.ones(total),
+                decay=np.where(peak, 0.015, 0.015 * 1.2),
+                value=value,
+                max_height=height + 1.5 * value,
+                x_velocity=(draws[bars, 2 + 2 * nth] * 0.04 - 0.02) * value,
+            )
+        self.update()
+
+    def update(self):
+        n = self.count
+        velocity = self._arrays['velocity'][:n]
+        self._xy[:n, 1] += velocity
+        self._xy[:n, 0] += self._arrays['x_velocity'][:n]
+        # Slow deceleration while rising, gentle fall afterwards
+        velocity *= np.where(self._xy[:n, 1] < self._arrays['max_height'][:n], 0.99, 0.95)
+        self._arrays['life'][:n] -= self._arrays['decay'][:n]
+        self._cull()
+
+
+class RadialParticles(ParticleSystem):
+    """Particles flying outwards from the bars of the circular visualization"""
+
+    fields = ParticleSystem.fields + ('angle', 'height', 'base_radius')
+
+    def spawn(self, values: np.ndarray, last_values: np.ndarray, base_radius: float):
+        """Spawn particles at rising bars and step all of them"""
+        # One draw: spawn chance, velocity and decay for every possible
+        # particle, then angular jitter for every slot that can be alive
+        per_bar = 1 + 2 * _MAX_SPAWN_PER_BAR
+        batch = self.rng.random(len(values) * per_bar + self.capacity)
+        draws = batch[:len(values) * per_bar].reshape(len(values), per_bar)
+        counts, _ = self.spawn_counts(values, last_values, draws[:, 0], random_rate=0)
+
+        total = int(counts.sum())
+        if total:
+            bars = np.repeat(np.arange(len(values)), counts)
+            nth = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            value = values[bars]
+            self._append(
+                np.zeros((total, 2)),
+                velocity=0.1 * (0.5 + draws[bars, 1 + 2 * nth]) * value,
+                life=np.ones(total),
+                decay=0.02 + 0.01 * draws[bars, 2 + 2 * nth],
+                value=value,
+                max_height=0.5 + 0.5 * value,
+                angle=2 * np.pi * bars / len(values),
+                height=np.zeros(total),
+                base_radius=np.zeros(total),
+            )
+        self.update(base_radius, batch[len(values) * per_bar:])
+
+    def update(self, base_radius: float, jitter: np.ndarray):
+        """Step the particles; ``jitter`` holds a uniform [0, 1) draw per slot"""
+        n = self.count
+        arrays = {name: array[:n] for name, array in self._arrays.items()}
+        arrays['base_radius'][:] = base_radius
+        arrays['height'] += arrays['velocity']
+        # Centred and scaled to unit variance, like the normal draw it replaces
+        arrays['angle'] += (jitter[:n] - 0.5) * _UNIT_VARIANCE * (0.02 * arrays['value'])
+
+        # Position relative to the end of the particle's bar
+        radius = arrays['base_radius'] + arrays['value'] * 1.2 + arrays['height']
+        self._xy[:n, 0] = radius * np.cos(arrays['angle'])
+        self._xy[:n, 1] = radius * np.sin(arrays['angle'])
+
+        arrays['velocity'] *= np.where(arrays['height'] < arrays['max_height'], 0.98, 0.85)
+        arrays['life'] -= arrays['decay'] * (1 + arrays['height'] / 2)
+        self._cull()
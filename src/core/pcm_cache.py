@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import uuid
+import numpy as np
+from pathlib import Path
+from typing import Optional
+
+from src.core.audio_track import AudioTrack, ProgressCallback, decode_blocks
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'audio-player' / 'pcm'
+DEFAULT_MAX_BYTES = 4 * 1024 ** 3
+
+# Bytes read from each end of a file for its content hash
+_HASH_SAMPLE_BYTES = 1024 * 1024
+
+
+def file_key(file_path: str) -> str:
+    """Key for the current contents of ``file_path``.
+
+    Built from path, size, mtime and a hash of the file's head and tail, so
+    it changes whenever the file is edited.
+    """
+    stat = os.stat(file_path)
+    content = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        content.update(f.read(_HASH_SAMPLE_BYTES))
+        if stat.st_size > 2 * _HASH_SAMPLE_BYTES:
+            f.seek(-_HASH_SAMPLE_BYTES, os.SEEK_END)
+            content.update(f.read(_HASH_SAMPLE_BYTES))
+    ident = f'{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}|{content.hexdigest()}'
+    return hashlib.sha1(ident.encode('utf-8')).hexdigest()
+
+
+class PCMCache:
+    """Persistent cache of decoded PCM backed by memory-mapped ``.npy`` files.
+
+    Each entry is a float32 ``(frames, channels)`` array stored as ``.npy``
+    next to a small JSON header with the sample rate. Entries are keyed by
+    path, size, mtime and a hash of the file's head and tail, so edited
+    files are decoded again. Hits are opened with ``np.load(mmap_mode='r')``
+    and cost no decoding and no copy; the least recently used entries are
+    evicted once the cache exceeds ``max_bytes``.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def key(self, file_path: str) -> str:
+        """Cache key for the current contents of ``file_path``"""
+        return file_key(file_path)
+
+    def _paths(self, key: str):
+        return self.cache_dir / f'{key}.npy', self.cache_dir / f'{key}.json'
+
+    def get(self, file_path: str, key: Optional[str] = None) -> Optional[AudioTrack]:
+        """Return a memory-mapped track for ``file_path`` or None on a miss.
+
+        Pass ``key`` when it is already known to skip hashing the file.
+        """
+        data_path, header_path = self._paths(key or self.key(file_path))
+        try:
+            with open(header_path) as f:
+                header = json.load(f)
+            data = np.load(data_path, mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        # Touch the entry so eviction treats it as recently used
+        os.utime(data_path)
+        return AudioTrack(data[:header['frames']], header['sample_rate'], file_path)
+
+    def load(self, file_path: str, progress: Optional[ProgressCallback] = None) -> Optional[AudioTrack]:
+        """Return a cached track, decoding ``file_path`` into the cache on a miss.
+
+        Decoding goes block by block straight into the memory-mapped file,
+        so it never holds the whole track in RAM. Returns None if the
+        decoded track would not fit in the cache at all.
+        """
+        key = self.key(file_path)
+        track = self.get(file_path, key)
+        if track is not None:
+            return track
+
+        data_path, header_path = self._paths(key)
+        # Unique per load; the player and the decode-ahead thread may load the same file
+        tmp_path = self.cache_dir / f'{key}.{uuid.uuid4().hex}.tmp.npy'
+        import soundfile as sf
+        with sf.SoundFile(file_path) as f:
+            shape = (f.frames, f.channels)
+            if f.frames * f.channels * 4 > self.max_bytes:
+                return None
+            try:
+                data = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=shape)
+                pos = decode_blocks(f, data, progress)
+                data.flush()
+                del data
+                os.replace(tmp_path, data_path)
+            finally:
+                # Only left behind if decoding failed; evict() doesn't count it
+                tmp_path.unlink(missing_ok=True)
+            header = {'frames': pos, 'sample_rate': f.samplerate, 'channels': f.channels,
+                      'source': os.path.abspath(file_path)}
+
+        with open(header_path, 'w') as f:
+            json.dump(header, f)
+        self.evict(keep=key)
+        return self.get(file_path, key)
+
+    def size(self) -> int:
+        """Total bytes used by cached PCM"""
+        return sum(p.stat().st_size for p in self.cache_dir.glob('*.npy'))
+
+    def evict(self, keep: Optional[str] = None):
+        """Drop least recently used entries until the cache fits ``max_bytes``"""
+        entries = []
+        for data_path in self.cache_dir.glob('*.npy'):
+            if data_path.name.endswith('.tmp.npy'):
+                continue
+            stat = data_path.stat()
+            entries.append((stat.st_mtime, stat.st_size, data_path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, data_path in entries:
+            if total <= self.max_bytes:
+                break
+            if data_path.stem == keep:
+                continue
+            try:
+                data_path.unlink()
+                data_path.with_suffix('.json').unlink(missing_ok=True)
+            except OSError:
+                # Still mapped by another process on platforms that lock it
+                continue
+            total -= size
+
+    def clear(self):
+        for path in list(self.cache_dir.glob('*.npy')) + list(self.cache_dir.glob('*.json')):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,113 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.core.audio_track import ProgressCallback
+
+DEFAULT_BASE_BLOCK = 256
+# Base blocks reduced per read while building
+_READ_BLOCKS = 4096
+
+
+class PeakPyramid:
+    """Multi-level min/max summary of a track's mono waveform.
+
+    Level 0 holds the minimum and maximum of every ``base_block`` samples;
+    each following level halves the previous one. Drawing picks the
+    coarsest level that still has at least one entry per pixel, so the cost
+    depends on the number of pixels and not on the length of the track.
+    """
+
+    def __init__(self, levels: List[Tuple[np.ndarray, np.ndarray]], base_block: int,
+                 sample_rate: int, frames: int):
+        self.levels = levels
+        self.base_block = base_block
+        self.sample_rate = sample_rate
+        self.frames = frames
+
+    @classmethod
+    def build(cls, track, base_block: int = DEFAULT_BASE_BLOCK,
+              progress: Optional[ProgressCallback] = None) -> 'PeakPyramid':
+        """Scan ``track`` once and build every level with vectorized reductions"""
+        builder = PeakPyramidBuilder(track.sample_rate, track.frames, base_block)
+        source = track.clone() if track.streaming else track
+        try:
+            step = base_block * _READ_BLOCKS
+            for start in range(0, track.frames, step):
+                mono = source.read(start, step).mean(axis=1, dtype=np.float32)
+                if len(mono) == 0:
+                    break
+                builder.feed(mono)
+                if progress is not None:
+                    progress(min(1.0, (start + step) / track.frames))
+        finally:
+            if source is not track:
+                source.close()
+        return builder.result()
+
+    @classmethod
+    def from_base_level(cls, mins: np.ndarray, maxs: np.ndarray, base_block: int,
+                        sample_rate: int, frames: int) -> 'PeakPyramid':
+        """Build the coarser levels on top of the ``base_block`` minima and maxima"""
+        levels = [(mins, maxs)]
+        while len(mins) > 1:
+            if len(mins) % 2:
+                mins = np.append(mins, mins[-1])
+                maxs = np.append(maxs, maxs[-1])
+            mins = mins.reshape(-1, 2).min(axis=1)
+            maxs = maxs.reshape(-1, 2).max(axis=1)
+            levels.append((mins, maxs))
+        return cls(levels, base_block, sample_rate, frames)
+
+    def columns(self, start_frame: int, end_frame: int, width: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Min and max of every one of ``width`` pixel columns over ``[start_frame, end_frame)``"""
+        if width <= 0 or end_frame <= start_frame:
+            empty = np.zeros(max(width, 0), dtype=np.float32)
+            return empty, empty
+        frames_per_pixel = (end_frame - start_frame) / width
+        level = int(np.clip(np.log2(max(frames_per_pixel / self.base_block, 1)), 0, len(self.levels) - 1))
+        mins, maxs = self.levels[level]
+        block = self.base_block << level
+
+        edges = np.linspace(start_frame, end_frame, width + 1) / block
+        starts = np.clip(edges[:-1].astype(np.intp), 0, len(mins) - 1)
+        stop = int(np.clip(np.ceil(edges[-1]), starts[-1] + 1, len(mins)))
+        # Only the entries inside the view are reduced
+        first = starts[0]
+        starts = starts - first
+        return (np.minimum.reduceat(mins[first:stop], starts),
+                np.maximum.reduceat(maxs[first:stop], starts))
+
+
+class PeakPyramidBuilder:
+    """Builds the PeakPyramid of ``total_frames`` samples fed in consecutive mono blocks"""
+
+    def __init__(self, sample_rate: int, total_frames: int, base_block: int = DEFAULT_BASE_BLOCK):
+        self.sample_rate = sample_rate
+        self.base_block = base_block
+        self.total_frames = total_frames
+        self.frames = 0
+        num_blocks = -(-total_frames // base_block)
+        self._mins = np.zeros(num_blocks, dtype=np.float32)
+        self._maxs = np.zeros(num_blocks, dtype=np.float32)
+        # Samples of a base block that is not complete yet
+        self._pending = np.zeros(0, dtype=np.float32)
+
+    def feed(self, mono: np.ndarray):
+        data = np.concatenate((self._pending, mono)) if len(self._pending) else mono
+        first = (self.frames - len(self._pending)) // self.base_block
+        count = min(len(data) // self.base_block, len(self._mins) - first)
+        blocks = data[:count * self.base_block].reshape(count, self.base_block)
+        self._mins[first:first + count] = blocks.min(axis=1)
+        self._maxs[first:first + count] = blocks.max(axis=1)
+        self._pending = data[count * self.base_block:].astype(np.float32, copy=True)
+        self.frames += len(mono)
+
+    def result(self) -> PeakPyramid:
+        """The pyramid of everything fed; a final partial block counts as a whole one"""
+        first = (self.frames - len(self._pending)) // self.base_block
+        if len(self._pending) and first < len(self._mins):
+            self._mins[first] = self._pending.min()
+            self._maxs[first] = self._pending.max()
+        return PeakPyramid.from_base_level(self._mins, self._maxs, self.base_block,
+                                           self.sample_rate, self.total_frames)
@@ -0,0 +1,87 @@
+import threading
+import time
+from typing import Optional
+
+
+class PlaybackClock:
+    """Single source of truth for the playback position.
+
+    The clock counts frames in the track's sample rate. Between updates it
+    interpolates with ``time.monotonic`` so readers get a smooth position at
+    any frame rate. Outputs that report the frames they hand to the device
+    through ``advance`` bound the interpolation, so the clock never runs
+    ahead of audio that has actually been delivered. Seeking moves the
+    clock directly; there is nothing to re-synchronise afterwards.
+    """
+
+    def __init__(self, sample_rate: int = 44100):
+        self._lock = threading.Lock()
+        self.sample_rate = sample_rate
+        self.total_frames: Optional[int] = None
+        self.running = False
+        self._frames = 0
+        self._anchor = time.monotonic()
+        self._delivered: Optional[int] = None
+
+    def reset(self, sample_rate: int, total_frames: Optional[int] = None):
+        """Prepare the clock for a new track, stopped at the start"""
+        with self._lock:
+            self.sample_rate = sample_rate
+            self.total_frames = total_frames
+            self.running = False
+            self._frames = 0
+            self._delivered = None
+            self._anchor = time.monotonic()
+
+    def _current_frame(self, now: float) -> int:
+        frame = self._frames
+        if self.running:
+            # The anchor lies ahead while a delayed start is pending
+            frame += max(0, int((now - self._anchor) * self.sample_rate))
+        if self._delivered is not None:
+            frame = min(frame, self._delivered)
+        if self.total_frames is not None:
+            frame = min(frame, self.total_frames)
+        return frame
+
+    def start(self, delay: float = 0.0):
+        """Start counting, ``delay`` seconds from now if audio before the track is still queued"""
+        with self._lock:
+            if not self.running:
+                self._anchor = time.monotonic() + delay
+                self.running = True
+
+    def pause(self):
+        with self._lock:
+            now = time.monotonic()
+            self._frames = self._current_frame(now)
+            self._anchor = now
+            self.running = False
+
+    def seek(self, seconds: float):
+        """Move the clock to ``seconds``; delivery is counted from there"""
+        with self._lock:
+            frame = max(0, int(seconds * self.sample_rate))
+            if self.total_frames is not None:
+                frame = min(frame, self.total_frames)
+            self._frames = frame
+            self._anchor = time.monotonic()
+            if self._delivered is not None:
+                self._delivered = frame
+
+    def advance(self, frames: int):
+        """Record ``frames`` more frames handed to the audio output"""
+        with self._lock:
+            if self._delivered is None:
+                self._delivered = self._frames
+            self._delivered += frames
+
+    @property
+    def frame(self) -> int:
+        with self._lock:
+            return self._current_frame(time.monotonic())
+
+    @property
+    def position(self) -> float:
+        """Current position in seconds"""
+        return self.frame / self.sample_rate if self.sample_rate else 0.0
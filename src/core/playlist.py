@@ -0,0 +1,199 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, Set
+
+import numpy as np
+
+from src.core.analysis import (DEFAULT_BAND_COUNTS, DEFAULT_FRAME_SIZE, DEFAULT_HOP,
+                               SpectralIndexBuilder)
+from src.core.audio_track import AudioTrack, silence_bounds
+from src.core.loudness import (ANALYSIS_BLOCK_FRAMES, LoudnessMeter, cached_loudness,
+                               store_loudness)
+from src.core.peaks import PeakPyramidBuilder
+
+# Shares of the reported progress spent decoding and in the analysis pass
+_PROGRESS_STEPS = (0.5, 0.5)
+
+
+def _scaled(progress, step: int):
+    if progress is None:
+        return None
+    offset = sum(_PROGRESS_STEPS[:step])
+    scale = _PROGRESS_STEPS[step]
+    return lambda fraction: progress(offset + scale * fraction)
+
+
+def prepare_track(file_path: str, cache=None, progress=None, trim: bool = True,
+                  streaming=None, loudness_cache=None, frame_size: int = DEFAULT_FRAME_SIZE,
+                  band_counts: Sequence[int] = DEFAULT_BAND_COUNTS) -> AudioTrack:
+    """Open ``file_path`` and get it ready for gapless playback.
+
+    Decodes the file, trims digital silence at both ends and attaches the
+    track's LoudnessResult as ``track.loudness`` (from ``loudness_cache``
+    when it has one), its SpectralIndex with ``frame_size`` and
+    ``band_counts`` as ``track.analysis`` and its PeakPyramid as
+    ``track.peaks``. All three come from one read of the track, so a
+    streaming track is decoded from disk only once more.
+    """
+    track = AudioTrack.open(file_path, streaming=streaming, cache=cache,
+                            progress=_scaled(progress, 0))
+    start, end = silence_bounds(track) if trim else (0, track.frames)
+    track.loudness = cached_loudness(track.path, loudness_cache)
+    meter = LoudnessMeter(track.sample_rate, track.channels) if track.loudness is None else None
+    track.analysis, track.peaks = _analyze(track, start, end, meter, frame_size, band_counts,
+                                           _scaled(progress, 1))
+    if meter is not None:
+        track.loudness = meter.result()
+        store_loudness(track.path, track.loudness, loudness_cache)
+    if start > 0 or end < track.frames:
+        track.trim(start, end)
+    return track
+
+
+def _analyze(track, start: int, end: int, meter: Optional[LoudnessMeter], frame_size: int,
+             band_counts: Sequence[int], progress=None):
+    """The SpectralIndex and PeakPyramid of frames ``start:end``, in one read.
+
+    ``meter`` is fed the whole track, so loudness matches a batch analysis
+    of the untrimmed file; without one only ``start:end`` is read.
+    """
+    index = SpectralIndexBuilder(track.sample_rate, end - start, frame_size, DEFAULT_HOP, band_counts)
+    peaks = PeakPyramidBuilder(track.sample_rate, end - start)
+    first, last = (0, track.frames) if meter is not None else (start, end)
+    # Streaming tracks are read through their own handle, leaving the playback window alone
+    source = track.clone() if track.streaming else track
+    try:
+        for block_start in range(first, last, ANALYSIS_BLOCK_FRAMES):
+            block = source.read(block_start, min(ANALYSIS_BLOCK_FRAMES, last - block_start))
+            if len(block) == 0:
+                # Header frame counts can overstate compressed files
+                break
+            if meter is not None:
+                meter.feed(block)
+            lo, hi = max(start, block_start), min(end, block_start + len(block))
+            if lo < hi:
+                mono = block[lo - block_start:hi - block_start].mean(axis=1, dtype=np.float32)
+                index.feed(mono)
+                peaks.feed(mono)
+            if progress is not None:
+                progress((block_start + len(block) - first) / (last - first))
+    finally:
+        if source is not track:
+            source.close()
+    return index.result(), peaks.result()
+
+
+class Playlist:
+    """Ordered queue of files with decode-ahead of the next entry.
+
+    While the current track plays, ``prepare_next`` decodes and trims the
+    following one on a background thread and hands it to a callback,
+    typically ``AudioEngine.queue_next``, so the engine can switch tracks
+    without a gap and without touching the GUI thread.
+    """
+
+    def __init__(self, cache=None, trim: bool = True, loudness_cache=None):
+        self.cache = cache
+        self.loudness_cache = loudness_cache
+        self.trim = trim
+        # Analysis layout of the visualizer; updated when its settings change
+        self.frame_size = DEFAULT_FRAME_SIZE
+        self.band_counts = DEFAULT_BAND_COUNTS
+        self.paths: List[str] = []
+        self.index = -1
+        # Entries that failed to decode; next_path and advance() pass over them
+        self._failed: Set[int] = set()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='decode-ahead')
+        self._pending_path: Optional[str] = None
+        self._pending: Optional[Future] = None
+
+    def set_paths(self, paths: List[str], index: int = 0):
+        self.paths = list(paths)
+        self.index = index if self.paths else -1
+        self._failed = set()
+        self._pending_path = None
+        self._pending = None
+
+    def add(self, paths: List[str]):
+        self.paths.extend(paths)
+        if self.index < 0 and self.paths:
+            self.index = 0
+
+    def clear(self):
+        self.set_paths([])
+
+    def __len__(self):
+        return len(self.paths)
+
+    @property
+    def current_path(self) -> Optional[str]:
+        if 0 <= self.index < len(self.paths):
+            return self.paths[self.index]
+        return None
+
+    def _next_index(self) -> Optional[int]:
+        index = self.index + 1
+        while index in self._failed:
+            index += 1
+        if 0 <= index < len(self.paths):
+            return index
+        return None
+
+    @property
+    def next_path(self) -> Optional[str]:
+        index = self._next_index()
+        return self.paths[index] if index is not None else None
+
+    def advance(self) -> Optional[str]:
+        """Make the next entry current and return its path"""
+        index = self._next_index()
+        if index is None:
+            return None
+        self.index = index
+        return self.current_path
+
+    def prepare_next(self, on_ready: Callable[[AudioTrack], None],
+                     on_failed: Optional[Callable[[str, str], None]] = None) -> Optional[Future]:
+        """Decode the next entry in the background and pass it to ``on_ready``.
+
+        ``on_ready`` runs on the decode thread. It is skipped, and the track
+        closed, if the playlist moved on while the track was decoding. If
+        decoding fails the entry is marked so ``next_path`` passes over it,
+        and ``on_failed`` gets the path and the error message; call
+        ``prepare_next`` again from there to decode the entry after it.
+        """
+        index = self._next_index()
+        if index is None:
+            return None
+        path = self.paths[index]
+        if self._pending is not None and self._pending_path == path:
+            return self._pending
+
+        def deliver(future: Future):
+            if future.cancelled():
+                return
+            error = future.exception()
+            if error is not None:
+                if self._pending is future:
+                    self._failed.add(index)
+                    self._pending_path = None
+                    self._pending = None
+                    if on_failed is not None:
+                        on_failed(path, str(error))
+                return
+            track = future.result()
+            if self.next_path == path and self._pending is future:
+                on_ready(track)
+            else:
+                track.close()
+
+        self._pending_path = path
+        self._pending = self._executor.submit(prepare_track, path, cache=self.cache, trim=self.trim,
+                                             loudness_cache=self.loudness_cache,
+                                             frame_size=self.frame_size, band_counts=self.band_counts)
+        self._pending.add_done_callback(deliver)
+        return self._pending
+
+    def shutdown(self):
+        if self._pending is not None:
+            self._pending.cancel()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,29 @@
+from contextlib import contextmanager
+import time
+
+
+class StartupTimer:
+    """Wall-clock time of each step between process start and a usable window.
+
+    Only imports the standard library, so it can be created before
+    anything it is meant to measure.
+    """
+
+    def __init__(self, origin=None):
+        self.origin = time.perf_counter() if origin is None else origin
+        # (name, start, end) in perf_counter seconds
+        self.steps = []
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, start, time.perf_counter()))
+
+    def report(self) -> str:
+        lines = [f"{'startup step':<30}{'ms':>9}{'done at':>10}"]
+        for name, start, end in self.steps:
+            lines.append(f"{name:<30}{(end - start) * 1000:9.1f}{(end - self.origin) * 1000:10.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,75 @@
+# uint8 RGB tables of the matplotlib colormaps the QPainter renderer uses,
+# sampled at 256 points like ColorLUT.from_colormap, so painting never
+# imports matplotlib. Regenerate with:
+#   np.rint(colormaps[name](np.linspace(0, 1, 256))[:, :3] * 255).astype(np.uint8).tobytes().hex()
+
+RGB8_TABLES = {
+    'cool': (
+        '00ffff01feff02fdff03fcff04fbff05faff06f9ff07f8ff'
+        '08f7ff09f6ff0af5ff0bf4ff0cf3ff0df2ff0ef1ff0ff0ff'
+        '10efff11eeff12edff13ecff14ebff15eaff16e9ff17e8ff'
+        '18e7ff19e6ff1ae5ff1be4ff1ce3ff1de2ff1ee1ff1fe0ff'
+        '20dfff21deff22ddff23dcff24dbff25daff26d9ff27d8ff'
+        '28d7ff29d6ff2ad5ff2bd4ff2cd3ff2dd2ff2ed1ff2fd0ff'
+        '30cfff31ceff32cdff33ccff34cbff35caff36c9ff37c8ff'
+        '38c7ff39c6ff3ac5ff3bc4ff3cc3ff3dc2ff3ec1ff3fc0ff'
+        '40bfff41beff42bdff43bcff44bbff45baff46b9ff47b8ff'
+        '48b7ff49b6ff4ab5ff4bb4ff4cb3ff4db2ff4eb1ff4fb0ff'
+        '50afff51aeff52adff53acff54abff55aaff56a9ff57a8ff'
+        '58a7ff59a6ff5aa5ff5ba4ff5ca3ff5da2ff5ea1ff5fa0ff'
+        '609fff619eff629dff639cff649bff659aff6699ff6798ff'
+        '6897ff6996ff6a95ff6b94ff6c93ff6d92ff6e91ff6f90ff'
+        '708fff718eff728dff738cff748bff758aff7689ff7788ff'
+        '7887ff7986ff7a85ff7b84ff7c83ff7d82ff7e81ff7f80ff'
+        '807fff817eff827dff837cff847bff857aff8679ff8778ff'
+        '8877ff8976ff8a75ff8b74ff8c73ff8d72ff8e71ff8f70ff'
+        '906fff916eff926dff936cff946bff956aff9669ff9768ff'
+        '9867ff9966ff9a65ff9b64ff9c63ff9d62ff9e61ff9f60ff'
+        'a05fffa15effa25dffa35cffa45bffa55affa659ffa758ff'
+        'a857ffa956ffaa55ffab54ffac53ffad52ffae51ffaf50ff'
+        'b04fffb14effb24dffb34cffb44bffb54affb649ffb748ff'
+        'b847ffb946ffba45ffbb44ffbc43ffbd42ffbe41ffbf40ff'
+        'c03fffc13effc23dffc33cffc43bffc53affc639ffc738ff'
+        'c837ffc936ffca35ffcb34ffcc33ffcd32ffce31ffcf30ff'
+        'd02fffd12effd22dffd32cffd42bffd52affd629ffd728ff'
+        'd827ffd926ffda25ffdb24ffdc23ffdd22ffde21ffdf20ff'
+        'e01fffe11effe21dffe31cffe41bffe51affe619ffe718ff'
+        'e817ffe916ffea15ffeb14ffec13ffed12ffee11ffef10ff'
+        'f00ffff10efff20dfff30cfff40bfff50afff609fff708ff'
+        'f807fff906fffa05fffb04fffc03fffd02fffe01ffff00ff'
+    ),
+    'viridis': (
+        '44015444025645045745055946075a46085c460a5d460b5e'
+        '470d60470e61471063471164471365481467481668481769'
+        '48186a481a6c481b6d481c6e481d6f481f70482071482173'
+        '482374482475482576482677482878482979472a7a472c7a'
+        '472d7b472e7c472f7d46307e46327e46337f463480453581'
+        '453781453882443983443a83443b84433d84433e85423f85'
+        '4240864241864142874144874045884046883f47883f4889'
+        '3e49893e4a893e4c8a3d4d8a3d4e8a3c4f8a3c508b3b518b'
+        '3b528b3a538b3a548c39558c39568c38588c38598c375a8c'
+        '375b8d365c8d365d8d355e8d355f8d34608d34618d33628d'
+        '33638d32648e32658e31668e31678e31688e30698e306a8e'
+        '2f6b8e2f6c8e2e6d8e2e6e8e2e6f8e2d708e2d718e2c718e'
+        '2c728e2c738e2b748e2b758e2a768e2a778e2a788e29798e'
+        '297a8e297b8e287c8e287d8e277e8e277f8e27808e26818e'
+        '26828e26828e25838e25848e25858e24868e24878e23888e'
+        '23898e238a8d228b8d228c8d228d8d218e8d218f8d21908d'
+        '21918c20928c20928c20938c1f948c1f958b1f968b1f978b'
+        '1f988b1f998a1f9a8a1e9b8a1e9c891e9d891f9e891f9f88'
+        '1fa0881fa1881fa1871fa28720a38620a48621a58521a685'
+        '22a78522a88423a98324aa8325ab8225ac8226ad8127ad81'
+        '28ae8029af7f2ab07f2cb17e2db27d2eb37c2fb47c31b57b'
+        '32b67a34b67935b77937b87838b9773aba763bbb753dbc74'
+        '3fbc7340bd7242be7144bf7046c06f48c16e4ac16d4cc26c'
+        '4ec36b50c46a52c56954c56856c66758c7655ac8645cc863'
+        '5ec96260ca6063cb5f65cb5e67cc5c69cd5b6ccd5a6ece58'
+        '70cf5773d05675d05477d1537ad1517cd2507fd34e81d34d'
+        '84d44b86d54989d5488bd6468ed64590d74393d74195d840'
+        '98d83e9bd93c9dd93ba0da39a2da37a5db36a8db34aadc32'
+        'addc30b0dd2fb2dd2db5de2bb8de29bade28bddf26c0df25'
+        'c2df23c5e021c8e020cae11fcde11dd0e11cd2e21bd5e21a'
+        'd8e219dae319dde318dfe318e2e418e5e419e7e419eae51a'
+        'ece51befe51cf1e51df4e61ef6e620f8e621fbe723fde725'
+    ),
+}
@@ -0,0 +1,65 @@
+from functools import cached_property, lru_cache
+
+import numpy as np
+
+from src.ui.colormap_tables import RGB8_TABLES
+
+LUT_SIZE = 256
+
+
+class ColorLUT:
+    """A colormap sampled once into a quantized RGBA table.
+
+    Mapping values to colours is one fancy-index into the table instead of
+    a colormap call per value, so a frame's colours for a whole collection
+    come from a single array operation.
+
+    Both tables are built on first use. The uint8 one comes from
+    ``RGB8_TABLES`` when the colormap is listed there, so the QPainter
+    renderer never imports matplotlib; the float one always samples the
+    matplotlib colormap.
+    """
+
+    def __init__(self, name: str, size: int = LUT_SIZE):
+        self.name = name
+        self.size = size
+
+    @cached_property
+    def table(self) -> np.ndarray:
+        # Imported here so that merely importing this module stays cheap
+        from matplotlib import colormaps
+        return colormaps[self.name](np.linspace(0, 1, self.size))
+
+    @cached_property
+    def table8(self) -> np.ndarray:
+        shipped = RGB8_TABLES.get(self.name)
+        if shipped is None or self.size != LUT_SIZE:
+            return np.rint(self.table * 255).astype(np.uint8)
+        rgb = np.frombuffer(bytes.fromhex(''.join(shipped)), dtype=np.uint8).reshape(-1, 3)
+        return np.column_stack((rgb, np.full(len(rgb), 255, dtype=np.uint8)))
+
+    def indices(self, values) -> np.ndarray:
+        # Same binning as a matplotlib colormap with as many entries
+        size = self.size
+        values = np.asarray(values, dtype=np.float64)
+        return np.clip((values * size).astype(np.intp), 0, size - 1)
+
+    def __call__(self, values, alpha=None) -> np.ndarray:
+        """RGBA floats for ``values`` in 0..1, with an optional alpha per value"""
+        colors = self.table[self.indices(values)]
+        if alpha is not None:
+            colors[..., 3] = alpha
+        return colors
+
+    def rgba8(self, values, alpha=None) -> np.ndarray:
+        """Like calling the table, but as uint8 rows for painting"""
+        colors = self.table8[self.indices(values)]
+        if alpha is not None:
+            colors[..., 3] = np.rint(np.clip(alpha, 0, 1) * 255)
+        return colors
+
+
+@lru_cache(maxsize=None)
+def get_lut(name: str, size: int = LUT_SIZE) -> ColorLUT:
+    """Shared table for a matplotlib colormap, built on first use"""
+    return ColorLUT(name, size)
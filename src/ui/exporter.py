@@ -0,0 +1,287 @@
+import math
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from src.core.audio_track import AudioTrack
+from src.core.pcm_cache import PCMCache
+
+FORMATS = ('png', 'gif', 'raw')
+RENDERERS = ('qpainter', 'matplotlib')
+# Frames rendered and discarded before each segment so particles and
+# smoothing have settled by the first frame that is kept
+PREROLL_SECONDS = 1.0
+
+# Per-process state of the pool workers
+_app = None
+_tracks = {}
+
+
+class OfflineClock:
+    """Stands in for PlaybackClock; the exporter sets ``frame`` directly"""
+
+    def __init__(self, sample_rate: int):
+        self.sample_rate = sample_rate
+        self.running = True
+        self.frame = 0
+
+
+@dataclass
+class ExportJob:
+    """Everything a worker needs to render frames ``[start, end)``"""
+    path: str
+    cache_dir: Optional[str]
+    visualization: str
+    renderer: str
+    width: int
+    height: int
+    fps: int
+    start: int
+    end: int
+    preroll: int
+    fmt: str
+    output: str
+
+
+def output_format(output: str, fmt: Optional[str] = None) -> str:
+    """Pick the format from ``fmt`` or the output path"""
+    if fmt:
+        return fmt
+    if output == '-':
+        return 'raw'
+    suffix = Path(output).suffix.lower()
+    if suffix == '.gif':
+        return 'gif'
+    if suffix in ('.rgb', '.raw'):
+        return 'raw'
+    return 'png'
+
+
+def _init_worker():
+    global _app
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    _app = QApplication.instance() or QApplication([])
+
+
+def _open_track(path: str, cache_dir: Optional[str]):
+    # Workers share the decode through memory-mapped PCM cache entries
+    key = (path, cache_dir)
+    if key not in _tracks:
+        cache = PCMCache(cache_dir) if cache_dir else None
+        _tracks[key] = AudioTrack.open(path, streaming=False if cache else None, cache=cache)
+    return _tracks[key]
+
+
+def _create_visualizer(job: ExportJob, track):
+    from src.ui.widgets.visualizer_base import VisualizationType
+    if job.renderer == 'matplotlib':
+        from src.ui.widgets.waveform_visualizer import WaveformVisualizer
+        dpi = 100
+        visualizer = WaveformVisualizer(width=job.width / dpi, height=job.height / dpi,
+                                        dpi=dpi, blit=False)
+    else:
+        from src.ui.widgets.painter_visualizer import PainterVisualizer
+        visualizer = PainterVisualizer()
+    visualizer.resize(job.width, job.height)
+    visualizer.show()
+    visualizer.set_track(track)
+    visualizer.set_visualization_type(VisualizationType(job.visualization))
+    # Seeded per segment so an export is reproducible
+    visualizer.bar_particles.rng = np.random.default_rng(job.start)
+    visualizer.ring_particles.rng = np.random.default_rng(job.start + 1)
+    visualizer.set_clock(OfflineClock(track.sample_rate))
+    _app.processEvents()
+    return visualizer
+
+
+def _grab_rgb(visualizer, width: int, height: int) -> np.ndarray:
+    from PyQt5.QtGui import QImage
+    image = visualizer.grab().toImage().convertToFormat(QImage.Format_RGB888)
+    if image.width() != width or image.height() != height:
+        image = image.scaled(width, height)
+    # Rows are padded to four bytes
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    rows = np.frombuffer(bits, dtype=np.uint8).reshape(height, image.bytesPerLine())
+    return rows[:, :width * 3].reshape(height, width, 3).copy()
+
+
+def _gif_delay(fps: int) -> int:
+    # GIF delays are in hundredths of a second
+    return max(10, int(round(1000 / fps, -1)))
+
+
+def _gif_header(width: int, height: int) -> bytes:
+    from PIL import GifImagePlugin, Image
+    # Every frame carries its own palette; the global one only satisfies the format
+    header, _ = GifImagePlugin.getheader(Image.new('P', (width, height)), info={'loop': 0})
+    return b''.join(header)
+
+
+def render_segment(job: ExportJob):
+    """Render one segment in a pool worker.
+
+    Returns the number of PNGs written, or the path of a temporary file
+    holding the segment's raw RGB frames or encoded GIF frames.
+    """
+    track = _open_track(job.path, job.cache_dir)
+    visualizer = _create_visualizer(job, track)
+    segment_file = None
+    if job.fmt != 'png':
+        fd, segment_path = tempfile.mkstemp(prefix='export-', suffix=f'.{job.fmt}', dir=job.output)
+        segment_file = os.fdopen(fd, 'wb')
+    try:
+        for index in range(max(0, job.start - job.preroll), job.end):
+            visualizer.clock.frame = int(index * track.sample_rate / job.fps)
+            visualizer.update_plot()
+            if index < job.start:
+                continue
+            if job.fmt == 'png':
+                visualizer.grab().save(os.path.join(job.output, f'frame_{index:06d}.png'))
+                continue
+            rgb = _grab_rgb(visualizer, job.width, job.height)
+            if job.fmt == 'raw':
+                segment_file.write(rgb.tobytes())
+            else:
+                from PIL import GifImagePlugin, Image
+                # Quantize and encode here so the main process only copies bytes
+                frame = Image.fromarray(rgb).quantize(256, method=Image.Quantize.FASTOCTREE)
+                segment_file.writelines(GifImagePlugin.getdata(
+                    frame, duration=_gif_delay(job.fps), include_color_table=True))
+    finally:
+        visualizer.close()
+        visualizer.deleteLater()
+        _app.processEvents()
+        if segment_file is not None:
+            segment_file.close()
+
+    if job.fmt == 'png':
+        return job.end - job.start
+    return segment_path
+
+
+def plan_segments(total_frames: int, fps: int, workers: int):
+    """``(start, end)`` frame ranges, a few per worker so the pool stays busy"""
+    preroll = int(PREROLL_SECONDS * fps)
+    # Long enough that the preroll stays a small part of the work
+    length = max(4 * preroll, math.ceil(total_frames / (workers * 3)))
+    return [(start, min(start + length, total_frames)) for start in range(0, total_frames, length)]
+
+
+def export(path: str, output: str, visualization: str = 'Bars', renderer: str = 'qpainter',
+           width: int = 1280, height: int = 720, fps: int = 30, fmt: Optional[str] = None,
+           start: float = 0.0, duration: Optional[float] = None,
+           workers: Optional[int] = None, progress=None) -> int:
+    """Render ``visualization`` of ``path`` to ``output``; returns the frame count.
+
+    The timeline is cut into segments that a process pool renders in
+    parallel, each worker into its own offscreen widget, stepping frames at
+    exactly ``fps`` with no playback involved. ``output`` is a directory
+    for PNG sequences, a ``.gif`` file, or a raw RGB24 file (``-`` for
+    stdout) that can be piped into a video encoder. Raw and GIF segments
+    are appended to the output as they finish, so memory does not grow
+    with the length of the export. ``progress(done,
+    total)`` is called as segments complete.
+    """
+    fmt = output_format(output, fmt)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}")
+    workers = workers or os.cpu_count() or 1
+
+    # Decode once up front; workers then map the cached PCM
+    try:
+        cache = PCMCache()
+    except OSError:
+        cache = None
+    track = AudioTrack.open(path, streaming=False if cache else None, cache=cache)
+    end_time = track.duration if duration is None else min(track.duration, start + duration)
+    first = int(start * fps)
+    total = max(0, int(end_time * fps) - first)
+    track.close()
+
+    if fmt == 'png':
+        os.makedirs(output, exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix='audio-player-export-') if fmt != 'png' else output
+    jobs = [ExportJob(path, str(cache.cache_dir) if cache else None, visualization, renderer,
+                      width, height, fps, first + a, first + b, int(PREROLL_SECONDS * fps),
+                      fmt, work_dir)
+            for a, b in plan_segments(total, fps, workers)]
+
+    stream = None
+    if fmt != 'png':
+        stream = sys.stdout.buffer if output == '-' else open(output, 'wb')
+    if fmt == 'gif':
+        stream.write(_gif_header(width, height))
+    # Qt must not be forked, so every worker starts fresh
+    context = multiprocessing.get_context('spawn')
+    try:
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker) as pool:
+            done = 0
+            # map() yields in segment order, so output can be written as it arrives
+            for job, result in zip(jobs, pool.map(render_segment, jobs)):
+                if fmt != 'png':
+                    with open(result, 'rb') as f:
+                        while True:
+                            block = f.read(1 << 20)
+                            if not block:
+                                break
+                            stream.write(block)
+                    os.remove(result)
+                done += job.end - job.start
+                if progress is not None:
+                    progress(done, total)
+        if fmt == 'gif':
+            stream.write(b';')  # GIF trailer
+    finally:
+        if stream is not None and stream is not sys.stdout.buffer:
+            stream.close()
+        if fmt != 'png':
+            for name in os.listdir(work_dir):
+                os.remove(os.path.join(work_dir, name))
+            os.rmdir(work_dir)
+    return total
+
+
+def main(argv=None):
+    import argparse
+    from src.ui.widgets.visualizer_base import VisualizationType
+
+    parser = argparse.ArgumentParser(
+        description="Render a visualization of an audio file offline",
+        epilog="Raw output is RGB24; pipe it into an encoder, e.g. "
+               "'export.py song.mp3 - | ffmpeg -f rawvideo -pix_fmt rgb24 "
+               "-s 1280x720 -r 30 -i - -i song.mp3 out.mp4'")
+    parser.add_argument('input', help="audio file")
+    parser.add_argument('output', help="directory for PNGs, .gif file, .rgb/.raw file or - for stdout")
+    parser.add_argument('-v', '--visualization', default=VisualizationType.BARS.value,
+                        choices=[t.value for t in VisualizationType])
+    parser.add_argument('-r', '--renderer', default='qpainter', choices=RENDERERS)
+    parser.add_argument('-s', '--size', default='1280x720', help="WIDTHxHEIGHT (default %(default)s)")
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('-f', '--format', choices=FORMATS, help="override the format of the output path")
+    parser.add_argument('--start', type=float, default=0.0, help="seconds into the track")
+    parser.add_argument('--duration', type=float, help="seconds to render (default: to the end)")
+    parser.add_argument('-j', '--jobs', type=int, help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    width, height = (int(n) for n in args.size.lower().split('x'))
+    began = time.perf_counter()
+
+    def report(done, total):
+        elapsed = time.perf_counter() - began
+        print(f"\r{done}/{total} frames  {done / elapsed:.1f} fps  "
+              f"{done / args.fps / elapsed:.2f}x real time", end='', file=sys.stderr, flush=True)
+
+    frames = export(args.input, args.output, args.visualization, args.renderer, width, height,
+                    args.fps, args.format, args.start, args.duration, args.jobs, report)
+    print(f"\nRendered {frames} frames in {time.perf_counter() - began:.1f}s", file=sys.stderr)
+    return 0
@@ -0,0 +1,49 @@
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from src.core.analysis import DEFAULT_BAND_COUNTS, DEFAULT_FRAME_SIZE
+from src.core.playlist import prepare_track
+
+
+class FileLoaderSignals(QObject):
+    """Signals emitted by FileLoader, delivered on the GUI thread"""
+    progress = pyqtSignal(str, float)
+    finished = pyqtSignal(str, object)
+    failed = pyqtSignal(str, str)
+
+
+class FileLoader(QRunnable):
+    """Decode an audio file on a QThreadPool worker.
+
+    Every signal carries the file path so the window can ignore results
+    from loads that were superseded by a newer one.
+    """
+
+    def __init__(self, file_path: str, cache=None, streaming=None, loudness_cache=None,
+                 frame_size=DEFAULT_FRAME_SIZE, band_counts=DEFAULT_BAND_COUNTS):
+        super().__init__()
+        self.file_path = file_path
+        self.cache = cache
+        self.loudness_cache = loudness_cache
+        self.frame_size = frame_size
+        self.band_counts = band_counts
+        self.streaming = streaming
+        self.signals = FileLoaderSignals()
+        self._last_percent = -1
+
+    def _report_progress(self, fraction: float):
+        # Only emit when the whole percentage changes to keep the queue short
+        percent = int(fraction * 100)
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self.signals.progress.emit(self.file_path, fraction)
+
+    def run(self):
+        try:
+            track = prepare_track(self.file_path, cache=self.cache,
+                                  progress=self._report_progress, streaming=self.streaming,
+                                  loudness_cache=self.loudness_cache,
+                                  frame_size=self.frame_size, band_counts=self.band_counts)
+        except Exception as e:
+            self.signals.failed.emit(self.file_path, str(e))
+            return
+        self.signals.finished.emit(self.file_path, track)
@@ -0,0 +1,149 @@
+from collections import deque
+import time
+
+from PyQt5.QtCore import QObject, QTimer, QEvent, Qt, pyqtSignal
+
+from src.core.frame_profiler import NULL_PROFILER
+
+DEFAULT_FPS = 60
+
+
+class FrameScheduler(QObject):
+    """Single source of frame ticks for everything drawn per frame.
+
+    Callbacks run from one ``Qt.PreciseTimer`` at the target rate. When a
+    frame takes longer than the frame interval, the overdue tick that
+    follows is skipped instead of rendering two frames back to back;
+    skipped and late ticks count as dropped frames. The timer only runs
+    while the scheduler is active and the watched window is visible, not
+    minimized and exposed, so a paused, hidden or occluded player does no
+    per-frame work at all.
+    """
+
+    # Emitted with True when frames start and False when they stop
+    running_changed = pyqtSignal(bool)
+
+    def __init__(self, fps=DEFAULT_FPS, parent=None):
+        super().__init__(parent)
+        self._callbacks = []
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+
+        self._active = False
+        self._window = None
+        self._window_handle = None
+        self._skip = 0
+        self._last_tick = None
+        self._frame_times = deque()
+        self.dropped_frames = 0
+        # Receives the 'timer jitter' stage
+        self.profiler = NULL_PROFILER
+        self.set_fps(fps)
+
+    @property
+    def interval(self):
+        """Frame interval in seconds"""
+        return 1 / self.target_fps
+
+    @property
+    def running(self):
+        return self._timer.isActive()
+
+    @property
+    def fps(self):
+        """Frames rendered during the last second"""
+        self._expire(time.perf_counter())
+        return len(self._frame_times)
+
+    def set_fps(self, fps):
+        self.target_fps = max(1, int(fps))
+        self._timer.setInterval(max(1, round(1000 / self.target_fps)))
+
+    def add(self, callback):
+        """Call ``callback()`` on every rendered frame"""
+        self._callbacks.append(callback)
+
+    def remove(self, callback):
+        self._callbacks.remove(callback)
+
+    def set_active(self, active):
+        """Run frames only while there is something to animate"""
+        self._active = active
+        self._update_timer()
+
+    def reset_stats(self):
+        self.dropped_frames = 0
+        self._frame_times.clear()
+
+    def watch(self, window):
+        """Pause while ``window`` is hidden, minimized or occluded"""
+        self._window = window
+        window.installEventFilter(self)
+        self._attach_window_handle()
+        self._update_timer()
+
+    def _attach_window_handle(self):
+        # The native window only exists once the widget has been shown
+        handle = self._window.windowHandle()
+        if handle is not None and handle is not self._window_handle:
+            handle.installEventFilter(self)
+            self._window_handle = handle
+
+    def _visible(self):
+        if self._window is None:
+            return True
+        if not self._window.isVisible() or self._window.isMinimized():
+            return False
+        return self._window_handle is None or self._window_handle.isExposed()
+
+    def _update_timer(self):
+        should_run = self._active and self._visible()
+        if should_run and not self._timer.isActive():
+            self._skip = 0
+            self._last_tick = None
+            self._timer.start()
+            self.running_changed.emit(True)
+        elif not should_run and self._timer.isActive():
+            self._timer.stop()
+            self.running_changed.emit(False)
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Show, QEvent.Hide, QEvent.WindowStateChange, QEvent.Expose):
+            if event.type() == QEvent.Show:
+                self._attach_window_handle()
+            # Let the window process the change before looking at its state
+            QTimer.singleShot(0, self._update_timer)
+        return super().eventFilter(obj, event)
+
+    def _expire(self, now):
+        while self._frame_times and now - self._frame_times[0] > 1.0:
+            self._frame_times.popleft()
+
+    def _tick(self):
+        now = time.perf_counter()
+        interval = self.interval
+        # Ticks the event loop could not deliver in time are lost frames
+        if self._last_tick is not None:
+            # Jitter: how far this tick strayed from the timer's own interval
+            expected = self._timer.interval() / 1000
+            self.profiler.record('timer jitter', int(abs(now - self._last_tick - expected) * 1e9))
+            late = int((now - self._last_tick) / interval) - 1
+            if late > 0:
+                self.dropped_frames += late
+        self._last_tick = now
+
+        if self._skip > 0:
+            self._skip -= 1
+            self.dropped_frames += 1
+            return
+
+        for callback in self._callbacks:
+            callback()
+
+        done = time.perf_counter()
+        self._frame_times.append(done)
+        self._expire(done)
+        # An overdue tick fires right after an overrun; skip it rather than
+        # rendering two frames back to back
+        self._skip = 1 if done - now > interval else 0
@@ -0,0 +1,69 @@
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from src.core.loudness import analyze_files
+
+
+class LibraryScannerSignals(QObject):
+    """Signals emitted by LibraryScanner, delivered on the GUI thread"""
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class LibraryScanner(QRunnable):
+    """Bring a MusicLibrary up to date on a QThreadPool worker"""
+
+    def __init__(self, library, folders=None):
+        super().__init__()
+        self.library = library
+        self.folders = folders
+        self.signals = LibraryScannerSignals()
+        self._cancelled = False
+
+    def cancel(self):
+        """Stop after the batch being read"""
+        self._cancelled = True
+
+    def run(self):
+        try:
+            result = self.library.scan(self.folders, progress=self.signals.progress.emit,
+                                       cancelled=lambda: self._cancelled)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        finally:
+            # The pool thread is reused for other work; don't keep its connection
+            self.library.close()
+        self.signals.finished.emit(result)
+
+
+class LoudnessAnalyzer(QRunnable):
+    """Measure the loudness of library tracks in a process pool.
+
+    Runs on a QThreadPool worker that only waits on the pool; ``finished``
+    carries the number of files measured or found in the cache.
+    """
+
+    def __init__(self, library, cache, query=''):
+        super().__init__()
+        self.library = library
+        self.cache = cache
+        self.query = query
+        self.signals = LibraryScannerSignals()
+        self._cancelled = False
+
+    def cancel(self):
+        """Stop handing out files; ones being measured still finish"""
+        self._cancelled = True
+
+    def run(self):
+        try:
+            paths = self.library.paths(self.query)
+            results = analyze_files(paths, self.cache, progress=self.signals.progress.emit,
+                                    cancelled=lambda: self._cancelled)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        finally:
+            self.library.close()
+        self.signals.finished.emit(sum(result is not None for result in results.values()))
@@ -1,31 +1,91 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                            QPushButton, QLabel, QFileDialog, QComboBox,
-                           QStyle, QSlider, QSizePolicy, QShortcut)
-from PyQt5.QtCore import Qt, QTimer, QSize
+                           QStyle, QSlider, QSizePolicy, QShortcut, QCheckBox)
+from PyQt5.QtCore import Qt, QSize, QThreadPool, QTimer, pyqtSignal
 from PyQt5.QtGui import QPalette, QColor, QIcon, QKeySequence
-import pygame
-import soundfile as sf
-import time
 import sys
 import os
+import sqlite3
+import time
 
 # Add the project root directory to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
+from src.core.analysis_worker import AnalysisWorker
 from src.core.audio_engine import AudioEngine
-from src.ui.widgets.waveform_visualizer import WaveformVisualizer, VisualizationType
+from src.core.audio_output import PygameOutput
+from src.core.config import PERFORMANCE_PROFILES, load_config
+from src.core.frame_profiler import FrameProfiler
+from src.core.library import MusicLibrary
+from src.core.loudness import LoudnessCache
+from src.core.pcm_cache import PCMCache
+from src.core.playlist import Playlist
+from src.core.startup_timer import StartupTimer
+from src.ui.file_loader import FileLoader
+from src.ui.frame_scheduler import FrameScheduler
+from src.ui.widgets.library_browser import LibraryBrowser
+from src.ui.widgets.performance_hud import PerformanceHud
+from src.ui.widgets.player_state_overlay import PlayerStateOverlay
+from src.ui.widgets.waveform_overview import WaveformOverview
+from src.ui.widgets.painter_visualizer import PainterVisualizer
+from src.ui.widgets.visualizer_base import VisualizationType
+from src.ui.widgets.visualizer_placeholder import VisualizerPlaceholder
 from pathlib import Path
 
+
+def _matplotlib_visualizer(parent, blit=True):
+    # matplotlib is imported only once this renderer is first used
+    from src.ui.widgets.waveform_visualizer import WaveformVisualizer
+    return WaveformVisualizer(parent, width=7, height=4, blit=blit)
+
+
+# Visualizer render backends, selectable at runtime
+RENDERERS = {
+    "Matplotlib (blit)": _matplotlib_visualizer,
+    "Matplotlib": lambda parent: _matplotlib_visualizer(parent, blit=False),
+    "QPainter": PainterVisualizer,
+}
+# The matplotlib backends differ only in blitting, switched without a rebuild
+_MATPLOTLIB_BLIT = {"Matplotlib (blit)": True, "Matplotlib": False}
+
 class MainWindow(QMainWindow):
-    def __init__(self):
+    # Emitted from the audio feeder thread when the engine moves to the next track
+    track_changed = pyqtSignal(object)
+    # Emitted from the decode-ahead thread when the next entry fails to decode
+    next_track_failed = pyqtSignal(str, str)
+    # Emitted once the deferred part of startup is done
+    startup_finished = pyqtSignal()
+
+    def __init__(self, startup_timer=None):
         super().__init__()
-        self.audio_engine = AudioEngine()
+        self.startup_timer = startup_timer if startup_timer is not None else StartupTimer()
+        self._startup_pending = True
+        self.config = load_config()
+        self.audio_engine = AudioEngine(cache=self._create_pcm_cache(),
+                                        output=PygameOutput(buffer_size=self.config.buffer_size))
+        self.loudness_cache = self._create_loudness_cache()
+        self.playlist = Playlist(cache=self.audio_engine.cache, loudness_cache=self.loudness_cache)
+        self.playlist.frame_size = self.config.chunk_size
+        self.playlist.band_counts = self.config.band_counts
+        self.audio_engine.on_track_changed = self.track_changed.emit
+        self.track_changed.connect(self._on_track_changed)
+        self.next_track_failed.connect(self._on_next_track_failed)
+        # Analysis frames arrive twice per rendered frame
+        self.analysis_worker = AnalysisWorker(self.audio_engine.clock,
+                                              chunk_size=self.config.chunk_size,
+                                              band_counts=self.config.band_counts,
+                                              rate=2 * self.config.fps)
+        # Stage timings from the worker, the scheduler and the visualizer
+        self.profiler = FrameProfiler()
+        self.analysis_worker.profiler = self.profiler
         self.is_playing = False
         self.current_file = None
         self.seeking = False
         self.total_duration = 0
-        self.start_time = 0
-        self.pause_position = 0
+        self.loading_file = None
+        self._loaders = set()
+        # Opened on first use; scanning and SQLite stay out of startup
+        self.library_browser = None
         
         # Add keyboard shortcuts
         self.setup_shortcuts()
@@ -33,6 +93,22 @@ class MainWindow(QMainWindow):
         self.init_ui()
         self.apply_dark_theme()
 
+    def _create_pcm_cache(self):
+        """Create the decoded-PCM cache, or None if its directory is unusable"""
+        try:
+            return PCMCache()
+        except OSError as e:
+            print(f"Warning: PCM cache disabled: {e}")
+            return None
+
+    def _create_loudness_cache(self):
+        """Create the loudness measurement cache, or None if its directory is unusable"""
+        try:
+            return LoudnessCache()
+        except OSError as e:
+            print(f"Warning: loudness cache disabled: {e}")
+            return None
+
     def setup_shortcuts(self):
         """Setup keyboard shortcuts"""
         # Play/Pause - Space
@@ -50,11 +126,23 @@ class MainWindow(QMainWindow):
         # Open file - 'O' key
         self.shortcut_open = QShortcut(QKeySequence('O'), self)
         self.shortcut_open.activated.connect(self.load_file)
+
+        # Music library - 'L' key
+        self.shortcut_library = QShortcut(QKeySequence('L'), self)
+        self.shortcut_library.activated.connect(self.open_library)
         
         # Change visualization - Tab
         self.shortcut_viz = QShortcut(QKeySequence(Qt.Key_Tab), self)
         self.shortcut_viz.activated.connect(self.cycle_visualization)
 
+        # Performance HUD - F3
+        self.shortcut_hud = QShortcut(QKeySequence(Qt.Key_F3), self)
+        self.shortcut_hud.activated.connect(self.toggle_performance_hud)
+
+        # Dump frame statistics - F4
+        self.shortcut_stats = QShortcut(QKeySequence(Qt.Key_F4), self)
+        self.shortcut_stats.activated.connect(self.dump_frame_stats)
+
     def handle_play_shortcut(self):
         """Handle play/pause shortcut"""
         if self.play_button.isEnabled():
@@ -116,7 +204,7 @@ class MainWindow(QMainWindow):
 
     def init_ui(self):
         self.setWindowTitle('Audio Player')
-        self.setGeometry(100, 100, 1000, 700)
+        self.setGeometry(100, 100, self.config.window_width, self.config.window_height)
         icon_base_path = Path(__file__).parent / 'assets'
         # Set window icon
         icon_path = icon_base_path / 'icon.png'
@@ -161,7 +249,7 @@ class MainWindow(QMainWindow):
         self.viz_combo = QComboBox()
         self.viz_combo.addItems([viz_type.value for viz_type in VisualizationType])
         self.viz_combo.setFixedWidth(150)
-        self.viz_combo.setStyleSheet("""
+        combo_style = """
             QComboBox {
                 background-color: #19182f;
                 color: #888888;
@@ -180,16 +268,63 @@ class MainWindow(QMainWindow):
                 width: 12px;
                 height: 12px;
             }
-        """)
+        """
+        self.viz_combo.setStyleSheet(combo_style)
         self.viz_combo.currentTextChanged.connect(self._on_viz_type_changed)
         viz_selector_layout.addWidget(self.viz_combo)
         viz_selector_layout.addStretch()
+
+        # Render backend selector, with the frame time for comparison
+        self.frame_time_label = QLabel()
+        self.frame_time_label.setStyleSheet("color: #888888;")
+        viz_selector_layout.addWidget(self.frame_time_label)
+
+        renderer_label = QLabel("Renderer:")
+        renderer_label.setStyleSheet("color: #888888;")
+        viz_selector_layout.addWidget(renderer_label)
+
+        self.renderer_combo = QComboBox()
+        self.renderer_combo.addItems(list(RENDERERS))
+        self.renderer_combo.setFixedWidth(150)
+        self.renderer_combo.setStyleSheet(combo_style)
+        self.renderer_combo.currentTextChanged.connect(self.set_renderer)
+        viz_selector_layout.addWidget(self.renderer_combo)
+
+        profile_label = QLabel("Profile:")
+        profile_label.setStyleSheet("color: #888888;")
+        viz_selector_layout.addWidget(profile_label)
+
+        self.profile_combo = QComboBox()
+        self.profile_combo.addItems(list(PERFORMANCE_PROFILES))
+        self.profile_combo.setCurrentText(self.config.profile)
+        self.profile_combo.setFixedWidth(150)
+        self.profile_combo.setStyleSheet(combo_style)
+        self.profile_combo.setToolTip("Trade frame rate, detail and particles for CPU time")
+        self.profile_combo.currentTextChanged.connect(self.set_performance_profile)
+        viz_selector_layout.addWidget(self.profile_combo)
+
+        self.normalize_check = QCheckBox("Normalize")
+        self.normalize_check.setStyleSheet("color: #888888;")
+        self.normalize_check.setChecked(self.audio_engine.normalize)
+        self.normalize_check.setToolTip("Play every track at the same loudness")
+        self.normalize_check.toggled.connect(self.set_normalization)
+        viz_selector_layout.addWidget(self.normalize_check)
         
         layout.addWidget(viz_selector_container)
 
-        # Visualization section
-        self.visualizer = WaveformVisualizer(central_widget, width=7, height=4)
+        # Visualization section; the render backend is built by
+        # finish_startup once the window is on screen
+        self.visualizer = VisualizerPlaceholder(central_widget)
         layout.addWidget(self.visualizer, 1) 
+        self.visualizer.set_clock(self.audio_engine.clock)
+        self.visualizer.set_worker(self.analysis_worker)
+        self.visualizer.profiler = self.profiler
+        self.state_overlay = PlayerStateOverlay(self.visualizer)
+
+        # Whole-track overview above the progress slider
+        self.overview = WaveformOverview()
+        self.overview.seek_requested.connect(self.seek_to)
+        layout.addWidget(self.overview)
         
         # Progress section - Fixed height
         progress_widget = QWidget()
@@ -398,6 +533,20 @@ class MainWindow(QMainWindow):
 
         container_layout = QHBoxLayout(container)
         container_layout.addWidget(load_button)
+
+        library_button = QPushButton('Library')
+        library_button.setFixedHeight(40)
+        library_button.clicked.connect(self.open_library)
+        library_button.setStyleSheet(button_style + """
+            QPushButton {
+                background-color: #211951;
+            }
+            QPushButton:hover {
+                background-color: #2e0249;
+            }
+        """)
+        library_button.setToolTip("Music Library (L)")
+        container_layout.addWidget(library_button)
         container_layout.setSpacing(10)
 
         container_layout.setAlignment(Qt.AlignCenter)
@@ -414,7 +563,7 @@ class MainWindow(QMainWindow):
                 border-top: 1px solid #333333;
             }
         """)
-        shortcuts_info.setText("→ Skip 10s      |       ← Back 10s      |       Space Play/Pause        |       O Open File     |       Tab Change Visualization")
+        shortcuts_info.setText("→ Skip 10s      |       ← Back 10s      |       Space Play/Pause        |       O Open File     |       L Library       |       Tab Change Visualization     |       F3 Performance HUD      |       F4 Save Frame Stats")
         
         # Create a container for the status bar items
         status_container = QWidget()
@@ -437,62 +586,163 @@ class MainWindow(QMainWindow):
         if hasattr(self, 'viz_combo'):
             self.viz_combo.setToolTip("Change Visualization (Tab)")
 
-        # Initialize timer for updates
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_time_display)
-        self.update_timer.start(16)
+        # One scheduler drives the time display and the visualizer; it
+        # only runs while playing and while the window can be seen
+        self.frame_scheduler = FrameScheduler(fps=self.config.fps, parent=self)
+        self.frame_scheduler.profiler = self.profiler
+        self.frame_scheduler.add(self.update_time_display)
+        self.frame_scheduler.running_changed.connect(self.analysis_worker.set_active)
+        self.frame_scheduler.watch(self)
+
+        self.performance_hud = PerformanceHud(self.profiler, self.frame_scheduler, self.visualizer)
 
     def load_file(self):
-        file_path, _ = QFileDialog.getOpenFileName(
+        file_paths, _ = QFileDialog.getOpenFileNames(
             self,
-            "Select Audio File",
+            "Select Audio Files",
             "",
             "Audio Files (*.mp3 *.wav *.ogg);;All Files (*)"
         )
 
-        if file_path:
+        if file_paths:
+            self.play_paths(file_paths)
+
+    def play_paths(self, file_paths):
+        """Play ``file_paths`` in order"""
+        # The first file plays now, the rest are decoded ahead one by one
+        self.playlist.set_paths(file_paths)
+        self.start_loading(file_paths[0])
+
+    def open_library(self):
+        """Show the music library browser"""
+        if self.library_browser is None:
             try:
-                # Load audio data for visualization
-                audio_data, sample_rate = sf.read(file_path)
-                self.visualizer.set_audio_data(audio_data, sample_rate)
-                
-                # Load audio for playback
-                if self.audio_engine.load_file(file_path):
-                    self.current_file = file_path
-                    self.total_duration = len(audio_data) / sample_rate
-                    self.total_time_label.setText(self.format_time(self.total_duration))
-                    self.play_button.setEnabled(True)
-                    self.stop_button.setEnabled(True)
-                    self.progress_slider.setEnabled(True)
-                    self.file_label.setText(f'Loaded: {file_path.split("/")[-1]}')
-                    self.is_playing = False
-                    self.pause_position = 0
-                    self.play_button.setText('Play')
-                    self.statusBar().showMessage(f'Loaded {file_path}')
-                    # Enable skip buttons
-                    self.forward_button.setEnabled(True)
-                    self.backward_button.setEnabled(True)
-                else:
-                    self.statusBar().showMessage(f'Failed to load {file_path}')
-            except Exception as e:
-                self.statusBar().showMessage(f'Error: {str(e)}')
+                library = MusicLibrary()
+            except (OSError, sqlite3.Error) as e:
+                self.statusBar().showMessage(f"Library unavailable: {e}", 5000)
+                return
+            self.library_browser = LibraryBrowser(library, self.loudness_cache, self)
+            self.library_browser.play_requested.connect(self.play_paths)
+            # Pick up files added or changed since the last session
+            self.library_browser.scan()
+        self.library_browser.show()
+        self.library_browser.raise_()
+        self.library_browser.activateWindow()
+
+    def start_loading(self, file_path):
+        """Decode ``file_path`` on a worker thread while the UI keeps running"""
+        self.loading_file = file_path
+        loader = FileLoader(file_path, cache=self.audio_engine.cache,
+                            loudness_cache=self.loudness_cache,
+                            frame_size=self.config.chunk_size, band_counts=self.config.band_counts)
+        loader.signals.progress.connect(self._on_load_progress)
+        loader.signals.finished.connect(self._on_load_finished)
+        loader.signals.failed.connect(self._on_load_failed)
+        self._loaders.add(loader)
+        self.state_overlay.set_state("loading")
+        self.statusBar().showMessage(f'Loading {file_path}...')
+        QThreadPool.globalInstance().start(loader)
+
+    def _release_loader(self, file_path):
+        self._loaders = {l for l in self._loaders if l.file_path != file_path}
+
+    def _on_load_progress(self, file_path, fraction):
+        if file_path == self.loading_file:
+            self.state_overlay.set_progress(fraction)
+
+    def _on_load_failed(self, file_path, message):
+        self._release_loader(file_path)
+        if file_path != self.loading_file:
+            return
+        self.loading_file = None
+        self.state_overlay.set_state("error")
+        self.state_overlay.set_message(message)
+        self.statusBar().showMessage(f'Error: {message}')
+
+    def _on_load_finished(self, file_path, track):
+        self._release_loader(file_path)
+        if file_path != self.loading_file:
+            # A newer file was picked while this one was decoding
+            track.close()
+            return
+        self.loading_file = None
+
+        if self.is_playing:
+            self.stop_playback()
+        if not self.audio_engine.load_track(track):
+            self.state_overlay.set_state("error")
+            self.statusBar().showMessage(f'Failed to load {file_path}')
+            return
+
+        self.state_overlay.set_state(None)
+        self._show_track(file_path, track)
+        self.play_button.setEnabled(True)
+        self.stop_button.setEnabled(True)
+        self.progress_slider.setEnabled(True)
+        self.is_playing = False
+        self.play_button.setText('Play')
+        message = f'Loaded {file_path}'
+        if track.loudness is not None and track.loudness.integrated is not None:
+            message += (f'  |  {track.loudness.integrated:.1f} LUFS, '
+                        f'{track.loudness.gain_db(self.audio_engine.target_loudness):+.1f} dB')
+        self.statusBar().showMessage(message)
+        # Enable skip buttons
+        self.forward_button.setEnabled(True)
+        self.backward_button.setEnabled(True)
+        self._prepare_next()
+
+    def _show_track(self, file_path, track):
+        """Point the visualizer and the labels at ``track``"""
+        previous = self.visualizer.track
+        self.visualizer.set_track(track)
+        self.overview.set_track(track)
+        if previous is not None and previous is not track:
+            # The feeder may still be reading it
+            self.audio_engine.release(previous)
+        self.current_file = file_path
+        self.total_duration = track.duration
+        self.total_time_label.setText(self.format_time(self.total_duration))
+        name = file_path.split("/")[-1]
+        if len(self.playlist) > 1:
+            name += f' ({self.playlist.index + 1}/{len(self.playlist)})'
+        self.file_label.setText(f'Loaded: {name}')
+
+    def _prepare_next(self):
+        """Decode the next playlist entry in the background and queue it"""
+        self.playlist.prepare_next(self.audio_engine.queue_next, self.next_track_failed.emit)
+
+    def _on_next_track_failed(self, file_path, message):
+        """Report an entry that could not be decoded ahead and try the one after it"""
+        self.state_overlay.set_state("error")
+        self.state_overlay.set_message(f'{file_path.split("/")[-1]}: {message}')
+        self.statusBar().showMessage(f'Skipping {file_path}: {message}')
+        self._prepare_next()
+
+    def _on_track_changed(self, track):
+        """The engine moved on to the queued track without stopping"""
+        file_path = self.playlist.advance() or track.path
+        self.state_overlay.set_state(None)
+        self._show_track(file_path, track)
+        self.statusBar().showMessage(f'Playing {file_path}')
+        self._prepare_next()
 
     def toggle_playback(self):
         if not self.is_playing:
-            self.audio_engine.play(start_pos=self.pause_position)
+            if self.audio_engine.paused:
+                self.audio_engine.resume()
+            else:
+                self.audio_engine.play(start_pos=self.audio_engine.position)
             self.is_playing = True
             self.play_button.setText('Pause')  # Unicode pause symbol
             self.play_button.setIcon(self.style().standardIcon(QStyle.SP_MediaPause))
-            self.start_time = time.time() - self.pause_position
-            self.visualizer.timer.start(self.visualizer.update_interval)
+            self.frame_scheduler.set_active(True)
             self.statusBar().showMessage('Playing')
         else:
             self.audio_engine.pause()
             self.is_playing = False
             self.play_button.setText('Play')
             self.play_button.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay))
-            self.pause_position = time.time() - self.start_time
-            self.visualizer.timer.stop()
+            self.frame_scheduler.set_active(False)
             self.statusBar().showMessage('Paused')
 
     def start_seeking(self):
@@ -504,10 +754,11 @@ class MainWindow(QMainWindow):
     def stop_seeking(self):
         """Called when user releases the slider"""
         self.seeking = False
+        seek_time = (self.progress_slider.value() / 1000.0) * self.total_duration
         if self.is_playing:
-            seek_time = (self.progress_slider.value() / 1000.0) * self.total_duration
-            self.pause_position = seek_time
             self.audio_engine.play(start_pos=seek_time)
+        else:
+            self.audio_engine.seek(seek_time)
 
     def seek_position(self, value):
         """Called when slider value changes"""
@@ -522,26 +773,109 @@ class MainWindow(QMainWindow):
             self.is_playing = False
             self.play_button.setText('Play')
             self.play_button.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay))
-            self.pause_position = 0
             self.progress_slider.setValue(0)
+            self.overview.set_position(0)
             self.current_time_label.setText('00:00')
-            self.visualizer.timer.stop()
+            self.frame_scheduler.set_active(False)
             self.statusBar().showMessage('Stopped')
 
     def update_time_display(self):
         if self.is_playing and not self.seeking:
-            current_pos = pygame.mixer.music.get_pos() / 1000.0
-            if current_pos >= 0:
-                current_pos += self.pause_position
-                # Update time label
-                self.current_time_label.setText(self.format_time(current_pos))
-                # Update slider
-                slider_value = int((current_pos / self.total_duration) * 1000) if self.total_duration > 0 else 0
-                self.progress_slider.blockSignals(True)
-                self.progress_slider.setValue(slider_value)
-                self.progress_slider.blockSignals(False)
+            current_pos = self.audio_engine.position
+            # Update time label
+            self.current_time_label.setText(self.format_time(current_pos))
+            # Update slider
+            slider_value = int((current_pos / self.total_duration) * 1000) if self.total_duration > 0 else 0
+            self.progress_slider.blockSignals(True)
+            self.progress_slider.setValue(slider_value)
+            self.progress_slider.blockSignals(False)
+            self.overview.set_position(current_pos)
             
             self.visualizer.update_plot()
+            self.frame_time_label.setText(
+                f"{self.frame_scheduler.fps} fps | {self.visualizer.frame_time:.1f} ms/frame | "
+                f"{self.frame_scheduler.dropped_frames} dropped"
+            )
+
+    def set_renderer(self, name):
+        """Swap the visualizer for another render backend, keeping its state"""
+        old = self.visualizer
+        if name in _MATPLOTLIB_BLIT and hasattr(old, 'set_blit'):
+            old.set_blit(_MATPLOTLIB_BLIT[name])
+            self.frame_time_label.clear()
+            self.frame_scheduler.reset_stats()
+            self.profiler.reset()
+            return
+        new = RENDERERS[name](old.parentWidget())
+        new.apply_config(self.config)
+        new.set_clock(self.audio_engine.clock)
+        new.set_worker(self.analysis_worker)
+        if old.track is not None:
+            new.set_track(old.track)
+        new.set_visualization_type(old.visualization_type)
+        new.profiler = self.profiler
+
+        self.centralWidget().layout().replaceWidget(old, new)
+        # The layout only queues showing the new widget, and the first
+        # matplotlib import at startup can drop that; show it here
+        new.show()
+        self.state_overlay.attach(new)
+        self.performance_hud.attach(new)
+        old.deleteLater()
+        self.visualizer = new
+        self.frame_time_label.clear()
+        self.frame_scheduler.reset_stats()
+        self.profiler.reset()
+
+    def set_normalization(self, enabled):
+        """Turn loudness normalization on or off for the playing track and the next ones"""
+        self.audio_engine.set_normalization(enabled)
+        self.statusBar().showMessage('Loudness normalization ' + ('on' if enabled else 'off'), 3000)
+
+    def set_performance_profile(self, name):
+        """Switch to one of PERFORMANCE_PROFILES while the player keeps running"""
+        self.apply_config(self.config.with_profile(name))
+
+    def apply_config(self, config):
+        """Use ``config``'s frame rate, analysis and mixer settings from now on.
+
+        The visualizer and the frame rate change at once. Tracks loaded
+        from now on are indexed with the new layout; the current one is
+        analysed per chunk on the worker until then. A new mixer buffer
+        size reopens the output at the current position.
+        """
+        self.config = config
+        self.frame_scheduler.set_fps(config.fps)
+        self.analysis_worker.rate = 2 * config.fps
+        self.visualizer.apply_config(config)
+        self.playlist.frame_size = config.chunk_size
+        self.playlist.band_counts = config.band_counts
+        self.audio_engine.set_buffer_size(config.buffer_size)
+        self.frame_scheduler.reset_stats()
+        self.profiler.reset()
+        if self.profile_combo.currentText() != config.profile:
+            self.profile_combo.setCurrentText(config.profile)
+
+    def toggle_performance_hud(self):
+        """Show or hide per-stage frame timings over the visualizer"""
+        self.performance_hud.toggle()
+
+    def dump_frame_stats(self, path=None):
+        """Write the profiler's statistics as JSON and return the file path"""
+        if path is None:
+            stats_dir = Path.home() / '.cache' / 'audio-player' / 'stats'
+            stats_dir.mkdir(parents=True, exist_ok=True)
+            path = stats_dir / f"frame-stats-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        self.profiler.dump_json(path, {
+            'profile': self.config.profile,
+            'renderer': self.renderer_combo.currentText(),
+            'visualization': self.visualizer.visualization_type.value,
+            'target_fps': self.frame_scheduler.target_fps,
+            'fps': self.frame_scheduler.fps,
+            'dropped_frames': self.frame_scheduler.dropped_frames,
+        })
+        self.statusBar().showMessage(f"Frame stats saved to {path}", 5000)
+        return path
 
     def _on_viz_type_changed(self, viz_type_str):
         viz_type = VisualizationType(viz_type_str)
@@ -551,64 +885,49 @@ class MainWindow(QMainWindow):
         """Skip forward 10 seconds"""
         if not self.current_file:
             return
-        
-        # Calculate new position
-        current_pos = time.time() - self.start_time if self.is_playing else self.pause_position
-        new_pos = min(current_pos + 10, self.total_duration)
-        
-        # Store the playing state
-        was_playing = self.is_playing
-        
-        # Stop current playback
-        if self.is_playing:
-            self.audio_engine.pause()
-        
-        # Update position
-        self.pause_position = new_pos
-        
-        # Resume playback if it was playing
-        if was_playing:
-            self.audio_engine.play(start_pos=new_pos)
-            self.start_time = time.time() - new_pos
-        
-        # Update UI
-        slider_value = int((new_pos / self.total_duration) * 1000) if self.total_duration > 0 else 0
-        self.progress_slider.setValue(slider_value)
-        self.current_time_label.setText(self.format_time(new_pos))
-        self.statusBar().showMessage(f'Skipped to {self.format_time(new_pos)}')
+        self.seek_to(min(self.audio_engine.position + 10, self.total_duration))
 
     def skip_backward(self):
         """Skip backward 10 seconds"""
         if not self.current_file:
             return
-        
-        # Calculate new position
-        current_pos = time.time() - self.start_time if self.is_playing else self.pause_position
-        new_pos = max(0, current_pos - 10)
-        
-        # Store the playing state
-        was_playing = self.is_playing
-        
-        # Stop current playback
-        if self.is_playing:
-            self.audio_engine.pause()
-        
-        # Update position
-        self.pause_position = new_pos
-        
-        # Resume playback if it was playing
-        if was_playing:
-            self.audio_engine.play(start_pos=new_pos)
-            self.start_time = time.time() - new_pos
+        self.seek_to(max(0, self.audio_engine.position - 10))
+
+    def seek_to(self, new_pos):
+        """Seek to ``new_pos`` seconds and update the progress widgets"""
+        if not self.current_file:
+            return
+        self.audio_engine.seek(new_pos)
+        self.overview.set_position(new_pos)
         
         # Update UI
         slider_value = int((new_pos / self.total_duration) * 1000) if self.total_duration > 0 else 0
+        self.progress_slider.blockSignals(True)
         self.progress_slider.setValue(slider_value)
+        self.progress_slider.blockSignals(False)
         self.current_time_label.setText(self.format_time(new_pos))
         self.statusBar().showMessage(f'Skipped to {self.format_time(new_pos)}')
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._startup_pending:
+            self._startup_pending = False
+            # Runs once the events that put the window on screen are handled
+            QTimer.singleShot(0, self.finish_startup)
+
+    def finish_startup(self):
+        """Build the selected render backend in place of the placeholder"""
+        if isinstance(self.visualizer, VisualizerPlaceholder):
+            with self.startup_timer.stage('build visualizer'):
+                self.set_renderer(self.renderer_combo.currentText())
+        self.startup_finished.emit()
+
     def closeEvent(self, event):
-        self.update_timer.stop()
+        self.frame_scheduler.set_active(False)
+        if self.library_browser is not None:
+            self.library_browser.shutdown()
+        self.analysis_worker.close()
+        self.playlist.shutdown()
         self.audio_engine.cleanup()
         event.accept()
 
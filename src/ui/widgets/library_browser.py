@@ -0,0 +1,266 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QTableView,
+                             QPushButton, QLabel, QFileDialog, QHeaderView, QAbstractItemView)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QThreadPool, QTimer, pyqtSignal
+
+from src.ui.library_scanner import LibraryScanner, LoudnessAnalyzer
+
+# Rows fetched per query; only the pages being looked at are kept
+PAGE_SIZE = 200
+_MAX_PAGES = 16
+# Wait for a pause in typing before searching
+SEARCH_DELAY = 150
+
+
+def _format_duration(seconds):
+    if seconds is None:
+        return ""
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}:{seconds:02d}"
+
+
+class LibraryModel(QAbstractTableModel):
+    """Table over a MusicLibrary that loads rows a page at a time.
+
+    The row count and each page come from indexed SQLite queries, so the
+    view scrolls through any number of tracks without holding them all.
+    """
+
+    # (header, sort key, value of a LibraryTrack)
+    COLUMNS = (
+        ("Title", 'title', lambda t: t.title),
+        ("Folder", 'folder', lambda t: t.folder),
+        ("Duration", 'duration', lambda t: _format_duration(t.duration)),
+        ("Format", 'format', lambda t: t.format or ""),
+        ("Sample Rate", 'sample_rate', lambda t: f"{t.sample_rate} Hz" if t.sample_rate else ""),
+    )
+
+    def __init__(self, library, parent=None):
+        super().__init__(parent)
+        self.library = library
+        self.query = ""
+        self.sort_key = 'title'
+        self.descending = False
+        self._count = 0
+        self._pages = {}
+        self.refresh()
+
+    def refresh(self):
+        """Run the query again, e.g. after a scan"""
+        self.beginResetModel()
+        self._pages.clear()
+        self._count = self.library.count(self.query)
+        self.endResetModel()
+
+    def set_query(self, query):
+        if query != self.query:
+            self.query = query
+            self.refresh()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sort_key = self.COLUMNS[column][1]
+        self.descending = order == Qt.DescendingOrder
+        self.refresh()
+
+    def track(self, row):
+        page = self._pages.get(row // PAGE_SIZE)
+        if page is None:
+            if len(self._pages) >= _MAX_PAGES:
+                self._pages.pop(next(iter(self._pages)))
+            page = self.library.search(self.query, self.sort_key, self.descending,
+                                       PAGE_SIZE, row // PAGE_SIZE * PAGE_SIZE)
+            self._pages[row // PAGE_SIZE] = page
+        offset = row % PAGE_SIZE
+        return page[offset] if offset < len(page) else None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section][0]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            track = self.track(index.row())
+            return self.COLUMNS[index.column()][2](track) if track is not None else None
+        if role == Qt.ToolTipRole:
+            track = self.track(index.row())
+            return track.path if track is not None else None
+        return None
+
+
+class LibraryBrowser(QDialog):
+    """Search, sort and play tracks from the music library"""
+
+    # Emitted with the paths to play, the first one first
+    play_requested = pyqtSignal(list)
+
+    def __init__(self, library, loudness_cache=None, parent=None):
+        super().__init__(parent)
+        self.library = library
+        self.loudness_cache = loudness_cache
+        self.scanner = None
+        self.analyzer = None
+        # Own pool so a long scan never holds up decoding the next file
+        self.scan_pool = QThreadPool(self)
+        self.scan_pool.setMaxThreadCount(1)
+        self.analysis_pool = QThreadPool(self)
+        self.analysis_pool.setMaxThreadCount(1)
+        self.setWindowTitle("Library")
+        self.resize(900, 560)
+        self.setStyleSheet("""
+            QLineEdit, QTableView {
+                background-color: #211951;
+                border: none;
+                padding: 4px;
+            }
+            QTableView {
+                selection-background-color: #865DFF;
+                gridline-color: #191825;
+            }
+            QHeaderView::section {
+                background-color: #19182f;
+                color: #888888;
+                border: none;
+                padding: 4px;
+            }
+        """)
+
+        layout = QVBoxLayout(self)
+
+        top = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search titles and folders...")
+        top.addWidget(self.search_edit, 1)
+        add_button = QPushButton("Add Folder...")
+        add_button.clicked.connect(self.add_folder)
+        top.addWidget(add_button)
+        self.rescan_button = QPushButton("Rescan")
+        self.rescan_button.clicked.connect(lambda: self.scan())
+        top.addWidget(self.rescan_button)
+        layout.addLayout(top)
+
+        self.model = LibraryModel(library, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(0, Qt.AscendingOrder)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().hide()
+        # Rows all have the same height; don't measure each one
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.table.doubleClicked.connect(self.play_selected)
+        layout.addWidget(self.table, 1)
+
+        bottom = QHBoxLayout()
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #888888;")
+        bottom.addWidget(self.status_label, 1)
+        self.analyze_button = QPushButton("Analyze Loudness")
+        self.analyze_button.setToolTip("Measure the loudness of the listed tracks ahead of playback")
+        self.analyze_button.clicked.connect(self.analyze_loudness)
+        self.analyze_button.setEnabled(loudness_cache is not None)
+        bottom.addWidget(self.analyze_button)
+        play_button = QPushButton("Play")
+        play_button.clicked.connect(self.play_selected)
+        bottom.addWidget(play_button)
+        layout.addLayout(bottom)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY)
+        self.search_timer.timeout.connect(self._apply_search)
+        self.search_edit.textChanged.connect(self.search_timer.start)
+        self.search_edit.returnPressed.connect(self._apply_search)
+
+        self._show_count()
+
+    def _apply_search(self):
+        self.search_timer.stop()
+        self.model.set_query(self.search_edit.text())
+        self._show_count()
+
+    def _show_count(self):
+        self.status_label.setText(f"{self.model.rowCount():,} tracks")
+
+    def add_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Add Folder to Library")
+        if folder:
+            self.library.add_root(folder)
+            self.scan([folder])
+
+    def scan(self, folders=None):
+        """Rescan ``folders`` (default: every library folder) in the background"""
+        if self.scanner is not None:
+            return
+        self.scanner = LibraryScanner(self.library, folders)
+        self.scanner.signals.progress.connect(self._on_scan_progress)
+        self.scanner.signals.finished.connect(self._on_scan_finished)
+        self.scanner.signals.failed.connect(self._on_scan_failed)
+        self.rescan_button.setEnabled(False)
+        self.status_label.setText("Scanning...")
+        self.scan_pool.start(self.scanner)
+
+    def _on_scan_progress(self, done, total):
+        self.status_label.setText(f"Reading new and changed files... {done:,}/{total:,}")
+
+    def _on_scan_finished(self, result):
+        self.scanner = None
+        self.rescan_button.setEnabled(True)
+        self.model.refresh()
+        self.status_label.setText(
+            f"{self.model.rowCount():,} tracks  |  {result.added} added, {result.updated} updated, "
+            f"{result.removed} removed, {result.failed} unreadable in {result.seconds:.1f}s")
+
+    def _on_scan_failed(self, message):
+        self.scanner = None
+        self.rescan_button.setEnabled(True)
+        self.status_label.setText(f"Scan failed: {message}")
+
+    def analyze_loudness(self):
+        """Measure every listed track in the background so playback can skip it"""
+        if self.analyzer is not None or self.loudness_cache is None:
+            return
+        self.analyzer = LoudnessAnalyzer(self.library, self.loudness_cache, self.model.query)
+        self.analyzer.signals.progress.connect(self._on_analyze_progress)
+        self.analyzer.signals.finished.connect(self._on_analyze_finished)
+        self.analyzer.signals.failed.connect(self._on_analyze_failed)
+        self.analyze_button.setEnabled(False)
+        self.status_label.setText("Analyzing loudness...")
+        # The thread only waits on the worker processes; keep it off the scan pool
+        self.analysis_pool.start(self.analyzer)
+
+    def _on_analyze_progress(self, done, total):
+        self.status_label.setText(f"Analyzing loudness... {done:,}/{total:,}")
+
+    def _on_analyze_finished(self, measured):
+        self.analyzer = None
+        self.analyze_button.setEnabled(True)
+        self.status_label.setText(f"Loudness known for {measured:,} tracks")
+
+    def _on_analyze_failed(self, message):
+        self.analyzer = None
+        self.analyze_button.setEnabled(True)
+        self.status_label.setText(f"Loudness analysis failed: {message}")
+
+    def play_selected(self):
+        rows = sorted({index.row() for index in self.table.selectionModel().selectedRows()})
+        paths = [track.path for track in map(self.model.track, rows) if track is not None]
+        if paths:
+            self.play_requested.emit(paths)
+
+    def shutdown(self):
+        """Stop a running scan or analysis when the player exits"""
+        if self.scanner is not None:
+            self.scanner.cancel()
+        if self.analyzer is not None:
+            self.analyzer.cancel()
@@ -0,0 +1,276 @@
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QPainter, QColor, QPen, QPolygonF, QImage
+import numpy as np
+
+from src.ui.colormaps import get_lut
+from src.ui.widgets.visualizer_base import VisualizerBase, VisualizationType
+
+
+# Palette layout of the waveform image: background, fill levels, outline
+_WAVE_FILL_LEVELS = 64
+_WAVE_LINE_INDEX = _WAVE_FILL_LEVELS + 1
+
+
+# Particles are drawn in groups of equal alpha and size
+_PARTICLE_ALPHA_LEVELS = 8
+
+
+def _polygon(xs, ys):
+    """Build a QPolygonF by writing the coordinates into its buffer"""
+    polygon = QPolygonF(len(xs))
+    if len(xs):
+        buffer = polygon.data()
+        buffer.setsize(len(xs) * 2 * np.dtype(np.float64).itemsize)
+        points = np.frombuffer(buffer, dtype=np.float64).reshape(-1, 2)
+        points[:, 0] = xs
+        points[:, 1] = ys
+    return polygon
+
+
+class PainterVisualizer(QWidget, VisualizerBase):
+    """QPainter render backend.
+
+    Draws the same four visualizations as the matplotlib backend straight
+    onto the widget. The ``_update_*`` methods only store the geometry of
+    the next frame; ``paintEvent`` turns it into a few QPainter calls, with
+    no figure, artists or Agg pass in between. Data coordinates match the
+    axes limits of the matplotlib backend so both look alike.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+        self.background_color = QColor('#191825')
+        self.wave_color = QColor('#865dff')
+        self.accent_color = QColor('#00BFFF')
+        self.cool = get_lut('cool')
+        self.viridis = get_lut('viridis')
+
+        self._init_visualizer_state()
+        self._scene = None
+        self.wave_palette = self._wave_palette()
+        # Backing store of the waveform image; QImage does not own numpy memory
+        self._wave_pixels = None
+
+    def _colors(self, lut, values, alphas):
+        """QColors for ``values`` in 0..1 from a single table lookup"""
+        return [QColor(r, g, b, a) for r, g, b, a in lut.rgba8(values, alphas).tolist()]
+
+    def _wave_palette(self):
+        """Waveform colours pre-blended over the background"""
+        background = np.array(self.background_color.getRgb()[:3], dtype=np.float64)
+        wave = np.array(self.wave_color.getRgb()[:3], dtype=np.float64)
+
+        def blend(alpha):
+            r, g, b = np.rint(background + (wave - background) * alpha).astype(int)
+            return QColor(r, g, b).rgb()
+
+        # The fill fades from left to right like the matplotlib gradient
+        fill = [blend(0.3 + 0.7 * 0.8 * (1 - 0.5 * i / (_WAVE_FILL_LEVELS - 1)))
+                for i in range(_WAVE_FILL_LEVELS)]
+        return [self.background_color.rgb()] + fill + [blend(0.9)]
+
+    def set_visualization_type(self, viz_type: VisualizationType):
+        """Change the visualization type and reset the visualization."""
+        if viz_type != self.visualization_type:
+            self.visualization_type = viz_type
+            self.reset_visualization()
+
+    def reset_visualization(self):
+        """Reset the current visualization to its initial state."""
+        self.bar_particles.clear()
+        self.ring_particles.clear()
+        self.last_bar_values = None
+        self.particle_history = []
+        self.last_intensity = 0
+        self._scene = None
+        self.update()
+
+    def _update_waveform(self, chunk):
+        self._scene = chunk
+
+    def _update_bars(self, bar_values):
+        bar_values = self._bar_levels(bar_values)
+        self._step_bar_particles(bar_values)
+        self._scene = bar_values
+
+    def _update_spectrum(self, frame):
+        if self.sample_rate is None:
+            return
+        self._scene = (frame, self._spectrum_points(frame))
+
+    def _update_circular(self, bar_values):
+        self._scene = self._circular_levels(bar_values)
+
+    def _present(self):
+        # Paint synchronously so frame_time covers the drawing as well
+        self.repaint()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.background_color)
+        if self._scene is None or self.width() <= 0 or self.height() <= 0:
+            return
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+
+        if self.visualization_type == VisualizationType.WAVEFORM:
+            self._paint_waveform(painter, self._scene)
+        elif self.visualization_type == VisualizationType.BARS:
+            self._paint_bars(painter, self._scene)
+        elif self.visualization_type == VisualizationType.SPECTRUM:
+            self._paint_spectrum(painter, *self._scene)
+        elif self.visualization_type == VisualizationType.CIRCULAR:
+            self._paint_circular(painter, *self._scene)
+
+    def _to_pixels(self, x, y, x_range, y_range):
+        """Map data coordinates to widget pixels like a matplotlib axes"""
+        (x0, x1), (y0, y1) = x_range, y_range
+        px = (np.asarray(x) - x0) * (self.width() / (x1 - x0))
+        py = self.height() - (np.asarray(y) - y0) * (self.height() / (y1 - y0))
+        return px, py
+
+    def _marker_diameter(self, sizes):
+        # Scatter sizes are areas in points squared
+        return np.sqrt(sizes) * self.logicalDpiX() / 72
+
+    def _paint_waveform(self, painter, chunk):
+        painter.drawImage(0, 0, self._render_waveform(chunk))
+
+    def _render_waveform(self, chunk):
+        """Rasterise the filled waveform into a palette image with numpy.
+
+        Antialiased paths over a few thousand noisy vertices are slow in
+        QPainter, so every pixel column is filled between the baseline and
+        the signal's min/max in that column instead, and the outline joins
+        neighbouring columns.
+        """
+        width, height = self.width(), self.height()
+        xs, lows, highs = self._waveform_columns(chunk, width)
+        if len(xs) < width:
+            # Fewer samples than columns: spread them over the width
+            columns = np.linspace(0, len(chunk) - 1, width)
+            lows = highs = np.interp(columns, xs, lows)
+
+        half = (height - 1) / 2
+        top = np.rint(half - np.clip(highs, -1, 1) * half).astype(np.int32)
+        bottom = top if lows is highs else np.rint(half - np.clip(lows, -1, 1) * half).astype(np.int32)
+        previous_top = np.concatenate((top[:1], top[:-1]))
+        previous_bottom = np.concatenate((bottom[:1], bottom[:-1]))
+        baseline = int(round(half))
+        rows = np.arange(height, dtype=np.int32)[:, np.newaxis]
+
+        fill = (rows >= np.minimum(top, baseline)) & (rows <= np.maximum(bottom, baseline))
+        outline = ((rows >= np.minimum(top, previous_bottom) - 1)
+                   & (rows <= np.maximum(bottom, previous_top) + 1))
+        shade = 1 + (np.arange(width) * _WAVE_FILL_LEVELS // width).astype(np.uint8)
+
+        # Indexed8 rows are padded to a multiple of four bytes
+        stride = (width + 3) & ~3
+        pixels = np.zeros((height, stride), dtype=np.uint8)
+        view = pixels[:, :width]
+        np.copyto(view, shade, where=fill)
+        view[outline] = _WAVE_LINE_INDEX
+
+        self._wave_pixels = pixels
+        image = QImage(pixels.data, width, height, stride, QImage.Format_Indexed8)
+        image.setColorTable(self.wave_palette)
+        return image
+
+    def _paint_bars(self, painter, bar_values):
+        x_range, y_range = (-1, self.num_bars), (0, 1)
+        lefts, tops = self._to_pixels(np.arange(len(bar_values)) - 0.4, bar_values, x_range, y_range)
+        rights, bottom = self._to_pixels(np.arange(len(bar_values)) + 0.4, 0, x_range, y_range)
+
+        colors = self._colors(self.cool, bar_values, 0.6 + 0.4 * bar_values)
+        for left, top, right, color in zip(lefts, tops, rights, colors):
+            painter.fillRect(QRectF(left, top, right - left, bottom - top), color)
+
+        particles = self.bar_particles
+        xs, ys = self._to_pixels(particles.x, particles.y, x_range, y_range)
+        self._paint_particles(painter, xs, ys, self._marker_diameter(particles.sizes(30)), particles.alphas())
+
+    def _paint_particles(self, painter, xs, ys, diameters, alphas):
+        """Draw particles as round points, one drawPoints call per group.
+
+        Sizes are rounded to whole pixels and alphas to a few levels, so a
+        few thousand particles take a few dozen calls instead of one
+        ellipse each.
+        """
+        if len(xs) == 0:
+            return
+        sizes = np.maximum(1, np.rint(diameters)).astype(np.int64)
+        levels = np.rint(alphas * _PARTICLE_ALPHA_LEVELS).astype(np.int64)
+        groups = sizes * (_PARTICLE_ALPHA_LEVELS + 1) + levels
+        order = np.argsort(groups, kind='stable')
+        keys, starts = np.unique(groups[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+
+        color = QColor.fromRgbF(*self.particle_rgb)
+        pen = QPen()
+        pen.setCapStyle(Qt.RoundCap)
+        for key, start, end in zip(keys.tolist(), starts.tolist(), ends.tolist()):
+            size, level = divmod(key, _PARTICLE_ALPHA_LEVELS + 1)
+            color.setAlphaF(level / _PARTICLE_ALPHA_LEVELS)
+            pen.setColor(color)
+            pen.setWidth(size)
+            painter.setPen(pen)
+            members = order[start:end]
+            painter.drawPoints(_polygon(xs[members], ys[members]))
+        painter.setPen(Qt.NoPen)
+
+    def _paint_spectrum(self, painter, frame, points):
+        particle_x, particle_y, sizes, trail = points
+        nyquist = self.sample_rate / 2
+        x_range, y_range = (0, nyquist), (-0.1, 1.2)
+
+        # Frequency band highlights
+        quarter = self.width() / 4
+        band_colors = self._colors(self.cool, np.linspace(0, 1, 4), 0.1 + 0.2 * frame.highlights)
+        for i, color in enumerate(band_colors):
+            painter.fillRect(QRectF(i * quarter, 0, quarter, self.height()), color)
+
+        xs, ys = self._to_pixels(particle_x, particle_y, x_range, y_range)
+        diameters = self._marker_diameter(sizes)
+        colors = self._colors(self.viridis, frame.spectrum, 0.8)
+        for x, y, size, color in zip(xs, ys, diameters, colors):
+            painter.setBrush(color)
+            painter.drawEllipse(QPointF(x, y), size / 2, size / 2)
+
+        if trail is not None:
+            trail_color = QColor(self.accent_color)
+            trail_color.setAlphaF(0.4)
+            painter.setBrush(Qt.NoBrush)
+            painter.setPen(QPen(trail_color, 2))
+            # The trail is too jagged for antialiasing to be worth its cost
+            painter.setRenderHint(QPainter.Antialiasing, False)
+            painter.drawPolyline(_polygon(*self._to_pixels(trail[0], trail[1], x_range, y_range)))
+
+    def _paint_circular(self, painter, bar_values, intensity, base_radius):
+        # Equal aspect: the limit applies to the shorter side
+        limit = self.circular_limit
+        scale = min(self.width(), self.height()) / (2 * limit)
+        painter.translate(self.width() / 2, self.height() / 2)
+        painter.scale(scale, -scale)
+
+        center_color, = self._colors(self.cool, [intensity], 0.2 + 0.1 * intensity)
+        painter.setBrush(center_color)
+        painter.drawEllipse(QPointF(0, 0), base_radius, base_radius)
+
+        vertices = self._circular_bar_vertices(bar_values, intensity, base_radius)
+        colors = self._colors(self.cool, (bar_values + intensity) / 2, 0.4 + 0.6 * bar_values)
+        # One polygon holds every corner; each bar is a four-point slice of it
+        corners = _polygon(vertices[..., 0].ravel(), vertices[..., 1].ravel())
+        for idx, color in enumerate(colors):
+            painter.setBrush(color)
+            painter.drawConvexPolygon(corners.mid(4 * idx, 4))
+
+        # Particles are drawn in pixels so their size does not scale
+        painter.resetTransform()
+        particles = self.ring_particles
+        xs = self.width() / 2 + particles.x * scale
+        ys = self.height() / 2 - particles.y * scale
+        self._paint_particles(painter, xs, ys, self._marker_diameter(particles.sizes(20)), particles.alphas())
@@ -0,0 +1,137 @@
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import Qt, QEvent, QRectF, QTimer
+from PyQt5.QtGui import QPainter, QColor, QPen, QBrush, QFont, QFontMetrics
+
+from src.core.frame_profiler import HISTOGRAM_EDGES_MS
+
+# How often the numbers are refreshed while the HUD is shown
+REFRESH_INTERVAL = 250
+
+class PerformanceHud(QWidget):
+    """Per-stage frame timings drawn over the visualizer.
+
+    Shows mean, p95 and p99 of every stage the FrameProfiler has seen plus
+    a small histogram of its recent durations. The HUD samples the
+    profiler on its own slow timer and only while visible, so showing it
+    does not add work to every frame.
+    """
+
+    def __init__(self, profiler, scheduler=None, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.profiler = profiler
+        self.scheduler = scheduler
+        self.rows = []
+        self.header = ""
+
+        self.hud_font = QFont("monospace", 9)
+        self.hud_font.setStyleHint(QFont.TypeWriter)
+        metrics = QFontMetrics(self.hud_font)
+        self.line_height = metrics.height()
+        self.text_width = metrics.horizontalAdvance("x" * 44)
+        self.histogram_width = 4 * (len(HISTOGRAM_EDGES_MS) + 1)
+        self.margin = 8
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+        if parent is not None:
+            self.attach(parent)
+        self.hide()
+
+    def attach(self, widget):
+        """Float over ``widget`` instead of the current parent"""
+        previous = self.parent()
+        if previous is not None and previous is not widget:
+            visible = self.isVisible()
+            previous.removeEventFilter(self)
+            self.setParent(widget)
+            self.setVisible(visible)
+        widget.installEventFilter(self)
+        self._place()
+        self.raise_()
+
+    def toggle(self):
+        self.setVisible(not self.isVisible())
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+
+    def refresh(self):
+        """Take fresh numbers from the profiler and repaint"""
+        self.rows = []
+        for name in self.profiler.stage_names():
+            stats = self.profiler.stats(name)
+            if stats is not None:
+                self.rows.append((name, stats))
+        if self.scheduler is not None:
+            self.header = (f"{self.scheduler.fps} fps  {self.scheduler.dropped_frames} dropped"
+                           f"  (ms: mean / p95 / p99)")
+        else:
+            self.header = "ms: mean / p95 / p99"
+        self._place()
+        self.update()
+
+    def _place(self):
+        parent = self.parentWidget()
+        if parent is None:
+            return
+        lines = 1 + max(1, len(self.rows))
+        width = self.text_width + self.histogram_width + 3 * self.margin
+        height = lines * self.line_height + 2 * self.margin
+        self.setGeometry(self.margin, self.margin,
+                         min(width, parent.width()), min(height, parent.height()))
+        self.raise_()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+
+        # Same translucent panel as the player state overlay
+        painter.setBrush(QBrush(QColor(25, 24, 37, 200)))
+        painter.setPen(QPen(QColor(0, 191, 255, 30), 1))
+        painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
+
+        painter.setFont(self.hud_font)
+        ascent = QFontMetrics(self.hud_font).ascent()
+        y = self.margin
+        painter.setPen(QColor(0, 191, 255))
+        painter.drawText(self.margin, y + ascent, self.header)
+
+        if not self.rows:
+            y += self.line_height
+            painter.setPen(QColor(108, 112, 134))
+            painter.drawText(self.margin, y + ascent, "no frames yet")
+            return
+
+        histogram_x = self.margin * 2 + self.text_width
+        bar_width = self.histogram_width / (len(HISTOGRAM_EDGES_MS) + 1)
+        for name, stats in self.rows:
+            y += self.line_height
+            painter.setPen(QColor(205, 214, 244))
+            painter.drawText(self.margin, y + ascent,
+                             f"{name:<16}{stats['mean']:7.2f}{stats['p95']:7.2f}{stats['p99']:7.2f}")
+
+            # Histogram of the window, each bucket scaled to the fullest one
+            counts = stats['histogram']
+            peak = max(counts) or 1
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(134, 93, 255, 200))
+            for i, count in enumerate(counts):
+                if not count:
+                    continue
+                height = (self.line_height - 2) * count / peak
+                painter.drawRect(QRectF(histogram_x + i * bar_width, y + self.line_height - 1 - height,
+                                        bar_width - 1, height))
+
+    def eventFilter(self, obj, event):
+        if obj is self.parent() and event.type() == QEvent.Resize:
+            self._place()
+        return super().eventFilter(obj, event)
@@ -1,5 +1,5 @@
 from PyQt5.QtWidgets import QWidget, QLabel, QVBoxLayout
-from PyQt5.QtCore import Qt, QPropertyAnimation, QRect
+from PyQt5.QtCore import Qt, QPropertyAnimation, QRect, QEvent
 from PyQt5.QtGui import QPainter, QColor, QPen, QBrush
 
 class PlayerStateOverlay(QWidget):
@@ -40,9 +40,26 @@ class PlayerStateOverlay(QWidget):
         """)
         self.layout.addWidget(self.message_label, alignment=Qt.AlignCenter)
         
+        # Follow the size of the widget we cover
+        if parent is not None:
+            self.attach(parent)
+
         # Initial state
         self.set_state("no_file")
 
+    def attach(self, widget):
+        """Cover ``widget`` instead of the current parent"""
+        previous = self.parent()
+        if previous is not None and previous is not widget:
+            # setParent() hides the overlay; keep whatever state it shows
+            hidden = self.isHidden()
+            previous.removeEventFilter(self)
+            self.setParent(widget)
+            self.setHidden(hidden)
+        widget.installEventFilter(self)
+        self.setGeometry(widget.rect())
+        self.raise_()
+
     def set_state(self, state):
         """Update the overlay state and message"""
         states = {
@@ -61,6 +78,14 @@ class PlayerStateOverlay(QWidget):
         else:
             self.hide()
 
+    def set_message(self, message):
+        """Replace the message of the current state"""
+        self.message_label.setText(message)
+
+    def set_progress(self, fraction):
+        """Show loading progress as a percentage"""
+        self.set_message(f"Decoding and analysing... {int(fraction * 100)}%")
+
     def fade_in(self):
         """Fade in the overlay"""
         self.fade_animation.setStartValue(0)
@@ -84,9 +109,14 @@ class PlayerStateOverlay(QWidget):
         painter.drawRect(self.rect())
         
         # Optional: Add subtle border
-        painter.setPen(QPen(QColor("#00BFFF", 30), 1))
+        painter.setPen(QPen(QColor(0, 191, 255, 30), 1))
         painter.drawRect(self.rect())
 
+    def eventFilter(self, obj, event):
+        if obj is self.parent() and event.type() == QEvent.Resize:
+            self.setGeometry(obj.rect())
+        return super().eventFilter(obj, event)
+
     def resizeEvent(self, event):
         """Ensure the overlay covers the entire parent widget"""
         super().resizeEvent(event)
@@ -0,0 +1,293 @@
+from enum import Enum
+import numpy as np
+import time
+
+from src.core.analysis import analyze_chunk, SPECTRUM_STEP
+from src.core.audio_track import AudioTrack
+from src.core.frame_profiler import NULL_PROFILER
+from src.core.particles import BarParticles, RadialParticles
+
+class VisualizationType(Enum):
+    WAVEFORM = "Waveform"
+    BARS = "Bars"
+    SPECTRUM = "Spectrum"
+    CIRCULAR = "Circular"
+
+class VisualizerBase:
+    """State and animation logic shared by every render backend.
+
+    A backend widget mixes this in, calls ``_init_visualizer_state`` from
+    its constructor and implements ``_update_waveform(chunk)``,
+    ``_update_bars(values)``, ``_update_spectrum(frame)``,
+    ``_update_circular(values)`` and ``_present()``. Everything that decides
+    *what* is shown lives here, so all backends animate identically.
+    """
+
+    def _init_visualizer_state(self):
+        # Initialize basic properties
+        self.visualization_type = VisualizationType.WAVEFORM
+        self.track = None
+        self.analysis = None
+        self.clock = None
+        self.worker = None
+        self.sample_rate = None
+        self.spectrum_freqs = None
+        self.chunk_size = 2048
+
+        # Visualization-specific properties
+        self.num_bars = 64  # Number of bars for bar visualization
+        self.num_circular_bars = 32  # Number of bars for circular visualization
+
+        # Animation state
+        self.max_particles = 200
+        self.max_ring_particles = 300
+        self.bar_particles = BarParticles(self.max_particles)
+        self.ring_particles = RadialParticles(self.max_ring_particles)
+        self.last_bar_values = None
+        self.particle_history = []
+        self.max_history = 8
+        self.last_intensity = 0
+        # Column boundaries of the waveform, kept while the geometry is unchanged
+        self._column_layout = None
+
+        # Smoothed time spent in update_plot, in milliseconds
+        self.frame_time = 0.0
+        # Per-stage timings; a FrameProfiler when the HUD or stats are wanted
+        self.profiler = NULL_PROFILER
+
+    def set_audio_data(self, audio_data, sample_rate):
+        if audio_data.ndim == 1:
+            audio_data = audio_data[:, np.newaxis]
+        self.set_track(AudioTrack(audio_data, sample_rate))
+
+    def apply_config(self, config):
+        """Take the chunk size, bar counts and particle caps of an AudioPlayerConfig"""
+        self.chunk_size = config.chunk_size
+        self.num_bars = config.num_bars
+        self.num_circular_bars = config.num_circular_bars
+        self.max_particles = config.max_particles
+        self.max_ring_particles = config.max_ring_particles
+        self.bar_particles.resize(self.max_particles)
+        self.ring_particles.resize(self.max_ring_particles)
+        self.last_bar_values = None
+        self._column_layout = None
+        if self.sample_rate is not None:
+            self.spectrum_freqs = np.fft.rfftfreq(self.chunk_size, 1 / self.sample_rate)[::SPECTRUM_STEP]
+        if self.worker is not None:
+            self.worker.configure(self.chunk_size, (self.num_bars, self.num_circular_bars))
+        self.reset_visualization()
+
+    def set_clock(self, clock):
+        """Follow the position of a PlaybackClock"""
+        self.clock = clock
+
+    def set_worker(self, worker):
+        """Take frames from an AnalysisWorker instead of analysing on this thread"""
+        self.worker = worker
+        if worker is not None:
+            worker.configure(self.chunk_size, (self.num_bars, self.num_circular_bars))
+            if self.track is not None:
+                worker.set_track(self.track)
+
+    def set_track(self, track):
+        """Visualize an AudioTrack or StreamingAudioTrack without copying it"""
+        self.track = track
+        self.sample_rate = track.sample_rate
+        self.analysis = track.analysis
+        self.spectrum_freqs = np.fft.rfftfreq(self.chunk_size, 1 / self.sample_rate)[::SPECTRUM_STEP]
+        if self.worker is not None:
+            self.worker.set_track(track)
+
+    def _analysis_frame(self, current_frame):
+        """Look up the precomputed analysis, or analyse the chunk on the spot"""
+        index = self.analysis
+        if (index is not None and index.frame_size == self.chunk_size
+                and self.num_bars in index.bands and self.num_circular_bars in index.bands):
+            with self.profiler.stage('index lookup'):
+                return index.frame_at(current_frame)
+
+        chunk = self._read_chunk(current_frame)
+        if chunk is None:
+            return None
+        return analyze_chunk(chunk, self.sample_rate, (self.num_bars, self.num_circular_bars),
+                             self.profiler)
+
+    def _read_chunk(self, current_frame):
+        """Mono chunk centred on ``current_frame``, or None near the edges"""
+        chunk_start = max(0, current_frame - self.chunk_size // 2)
+        with self.profiler.stage('chunk fetch'):
+            chunk = self.track.read(chunk_start, self.chunk_size)
+        if len(chunk) < self.chunk_size:
+            return None
+        with self.profiler.stage('channel mixdown'):
+            return chunk.mean(axis=1)
+
+    def update_plot(self):
+        if self.track is None or self.clock is None or not self.clock.running:
+            return
+
+        current_frame = self.clock.frame
+        if current_frame >= self.track.frames:
+            return
+
+        start = time.perf_counter()
+        snapshot = None
+        if self.worker is not None:
+            # Only pick up the newest frame the worker has ready
+            snapshot = self.worker.latest()
+            if snapshot is None or snapshot.track is not self.track:
+                return
+
+        if self.visualization_type == VisualizationType.WAVEFORM:
+            chunk = snapshot.chunk if snapshot is not None else self._read_chunk(current_frame)
+            if chunk is None:
+                return
+            with self.profiler.stage('artist update'):
+                self._update_waveform(chunk)
+        else:
+            frame = snapshot.analysis if snapshot is not None else self._analysis_frame(current_frame)
+            if frame is None:
+                return
+            with self.profiler.stage('artist update'):
+                if self.visualization_type == VisualizationType.BARS:
+                    self._update_bars(frame.bands[self.num_bars])
+                elif self.visualization_type == VisualizationType.SPECTRUM:
+                    self._update_spectrum(frame)
+                elif self.visualization_type == VisualizationType.CIRCULAR:
+                    self._update_circular(frame.bands[self.num_circular_bars])
+
+        with self.profiler.stage('draw'):
+            self._present()
+        elapsed = (time.perf_counter() - start) * 1000
+        self.frame_time = elapsed if self.frame_time == 0 else 0.9 * self.frame_time + 0.1 * elapsed
+
+    def _bar_levels(self, bar_values):
+        """Shape raw band energies into bar heights"""
+        # Apply smoothing and scaling
+        bar_values = np.clip(bar_values, 0, 1)
+        return np.power(bar_values, 0.7)
+
+    def _last_values(self, bar_values):
+        """Bar values of the previous frame, or zeros after a change of layout"""
+        if self.last_bar_values is None or self.last_bar_values.shape != bar_values.shape:
+            return np.zeros_like(bar_values)
+        return self.last_bar_values
+
+    def _step_bar_particles(self, bar_values):
+        """Spawn particles on rising bars and advance the live ones"""
+        self.bar_particles.spawn(bar_values, self._last_values(bar_values))
+
+        # Store current values for next frame
+        self.last_bar_values = bar_values.copy()
+
+    # Colour of bar and ring particles; alpha follows their life
+    particle_rgb = (0, 0.75, 1)
+
+    def _particle_colors(self, particles):
+        """RGBA rows for every live particle"""
+        colors = np.empty((len(particles), 4))
+        colors[:, :3] = self.particle_rgb
+        colors[:, 3] = particles.alphas()
+        return colors
+
+    def _waveform_columns(self, chunk, columns):
+        """Min and max of ``chunk`` in each of ``columns`` pixel columns.
+
+        Returns ``(xs, lows, highs)`` with ``xs`` in samples. The column
+        boundaries are worked out once per chunk length and width, so a
+        frame costs two ``reduceat`` calls. With no more samples than
+        columns every sample is its own column and ``lows is highs``.
+        """
+        count = len(chunk)
+        if self._column_layout is None or self._column_layout[:2] != (count, columns):
+            if columns >= count:
+                starts, xs = None, np.arange(count, dtype=np.float64)
+            else:
+                edges = np.linspace(0, count, columns + 1)
+                starts = edges[:-1].astype(np.intp)
+                xs = (edges[:-1] + edges[1:]) / 2
+            self._column_layout = (count, columns, starts, xs)
+        starts, xs = self._column_layout[2:]
+        if starts is None:
+            return xs, chunk, chunk
+        return xs, np.minimum.reduceat(chunk, starts), np.maximum.reduceat(chunk, starts)
+
+    def _spectrum_points(self, frame):
+        """Particle positions and sizes plus the averaged trail, if any"""
+        # Normalized dB spectrum, already downsampled for the particles
+        particle_x = self.spectrum_freqs
+        magnitude = frame.spectrum
+
+        # Add some randomness to particle positions
+        particle_y = magnitude + np.random.normal(0, 0.02, len(magnitude))
+
+        # Update particle sizes based on magnitude
+        sizes = 50 + 100 * magnitude**2
+
+        # Update trail effect
+        self.particle_history.append((particle_x, particle_y))
+        if len(self.particle_history) > self.max_history:
+            self.particle_history.pop(0)
+
+        trail = None
+        if len(self.particle_history) > 1:
+            trail = (np.mean([x for x, _ in self.particle_history], axis=0),
+                     np.mean([y for _, y in self.particle_history], axis=0))
+        return particle_x, particle_y, sizes, trail
+
+    def _circular_levels(self, bar_values):
+        """Return bar values, smoothed intensity and the pulsing base radius"""
+        # Apply more aggressive smoothing and scaling
+        bar_values = np.clip(bar_values, 0, 1)
+        bar_values = np.power(bar_values, 0.5)  # Less aggressive power for more reactivity
+
+        # Calculate overall audio intensity with peak detection
+        avg_intensity = np.mean(bar_values)
+        peak_intensity = np.max(bar_values)
+        intensity = (avg_intensity * 0.3 + peak_intensity * 0.7)  # Weight peaks more
+
+        # Enhance peaks for more reactive scaling
+        intensity = np.power(intensity, 0.7)  # Make scaling more sensitive to changes
+
+        # Smooth intensity changes with faster response
+        smooth_factor = 0.5  # Reduced for faster response
+        intensity = (smooth_factor * self.last_intensity +
+                    (1 - smooth_factor) * intensity)
+        self.last_intensity = intensity
+
+        # Calculate the base radius with more dramatic scaling
+        base_radius = self.min_radius + (self.max_radius - self.min_radius) * intensity
+
+        # Add subtle pulse effect
+        pulse = 0.1 * np.sin(time.time() * 8)  # Faster, subtle pulse
+        base_radius *= (1 + pulse * intensity)
+
+        self.ring_particles.spawn(bar_values, self._last_values(bar_values), base_radius)
+        self.last_bar_values = bar_values.copy()
+        return bar_values, intensity, base_radius
+
+    def _circular_bar_vertices(self, bar_values, intensity, base_radius):
+        """Corners of every circular bar as an ``(n, 4, 2)`` array in data units"""
+        count = len(bar_values)
+        angles = 2 * np.pi * np.arange(count) / count
+        half_width = np.pi * base_radius / count * 0.85
+        # Pushed outwards a little with the intensity, longer with the value
+        inner = base_radius * (1 + 0.1 * bar_values * intensity)
+        outer = inner + bar_values * base_radius * 1.2
+        # Each bar points up in its own frame and is rotated into place
+        across = np.array([-half_width, half_width, half_width, -half_width])
+        along = np.stack((inner, inner, outer, outer), axis=1)
+        cos, sin = np.cos(angles)[:, np.newaxis], np.sin(angles)[:, np.newaxis]
+        vertices = np.empty((count, 4, 2))
+        vertices[..., 0] = across * cos - along * sin
+        vertices[..., 1] = across * sin + along * cos
+        return vertices
+
+    # Radius range of the circular visualization, in data units
+    min_radius = 2.5
+    max_radius = 6.0
+
+    @property
+    def circular_limit(self):
+        """Half-width of the circular view, with extra space for movement"""
+        return (self.max_radius + 4) * 1.2
@@ -0,0 +1,44 @@
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+from PyQt5.QtGui import QPainter, QColor
+
+from src.core.frame_profiler import NULL_PROFILER
+from src.ui.widgets.visualizer_base import VisualizationType
+
+
+class VisualizerPlaceholder(QWidget):
+    """Holds the visualizer's place until the real one is built.
+
+    It only paints the background and remembers the track and
+    visualization type it is given, so the main window can appear before
+    any render backend (and matplotlib) is loaded.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.background_color = QColor('#191825')
+        self.track = None
+        self.visualization_type = VisualizationType.WAVEFORM
+        self.frame_time = 0.0
+        self.profiler = NULL_PROFILER
+
+    def apply_config(self, config):
+        pass
+
+    def set_clock(self, clock):
+        pass
+
+    def set_worker(self, worker):
+        pass
+
+    def set_track(self, track):
+        self.track = track
+
+    def set_visualization_type(self, viz_type):
+        self.visualization_type = viz_type
+
+    def update_plot(self):
+        pass
+
+    def paintEvent(self, event):
+        QPainter(self).fillRect(self.rect(), self.background_color)
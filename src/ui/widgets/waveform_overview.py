@@ -0,0 +1,125 @@
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+from PyQt5.QtCore import Qt, pyqtSignal, QRectF
+from PyQt5.QtGui import QPainter, QColor, QImage, QPen
+import numpy as np
+
+
+class WaveformOverview(QWidget):
+    """Whole-track waveform that doubles as a scrub bar.
+
+    Columns come from the track's PeakPyramid and are rasterised into a
+    cached QImage with numpy, so repainting for a moving playhead only
+    blits the image. The image is rebuilt when the size or zoom changes.
+    Click or drag to seek, use the mouse wheel to zoom around the cursor
+    and double-click to show the whole track again.
+    """
+
+    seek_requested = pyqtSignal(float)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.setFixedHeight(60)
+        self.setCursor(Qt.PointingHandCursor)
+
+        self.background_color = QColor('#19182f')
+        self.wave_color = np.array([0x86, 0x5d, 0xff, 0xff], dtype=np.uint8)
+        self.played_color = QColor(0x86, 0x5d, 0xff, 70)
+        self.playhead_color = QColor('#ffffff')
+
+        self.peaks = None
+        self.duration = 0.0
+        self.position = 0.0
+        self.view_start = 0.0
+        self.view_end = 0.0
+        self._image = None
+        self._image_key = None
+        # Backing store of _image; QImage does not own numpy memory
+        self._pixels = None
+
+    def set_track(self, track):
+        self.peaks = getattr(track, 'peaks', None)
+        self.duration = track.duration
+        self.position = 0.0
+        self.reset_zoom()
+
+    def clear(self):
+        self.peaks = None
+        self.duration = 0.0
+        self._image = None
+        self.update()
+
+    def reset_zoom(self):
+        self.view_start = 0.0
+        self.view_end = self.duration
+        self.update()
+
+    def set_position(self, seconds):
+        self.position = seconds
+        self.update()
+
+    def _x_to_time(self, x):
+        span = self.view_end - self.view_start
+        return self.view_start + span * min(max(x / max(self.width(), 1), 0.0), 1.0)
+
+    def _time_to_x(self, seconds):
+        span = self.view_end - self.view_start
+        return (seconds - self.view_start) / span * self.width() if span > 0 else 0
+
+    def _render_image(self):
+        width, height = self.width(), self.height()
+        key = (width, height, self.view_start, self.view_end, id(self.peaks))
+        if key == self._image_key:
+            return self._image
+
+        sample_rate = self.peaks.sample_rate
+        mins, maxs = self.peaks.columns(int(self.view_start * sample_rate),
+                                        int(self.view_end * sample_rate), width)
+        # Map -1..1 to pixel rows and fill every row between min and max per column
+        half = (height - 1) / 2
+        top = np.rint(half - np.clip(maxs, -1, 1) * half).astype(np.int32)
+        bottom = np.rint(half - np.clip(mins, -1, 1) * half).astype(np.int32)
+        rows = np.arange(height, dtype=np.int32)[:, np.newaxis]
+        mask = (rows >= top) & (rows <= bottom)
+
+        pixels = np.zeros((height, width, 4), dtype=np.uint8)
+        pixels[mask] = self.wave_color[[2, 1, 0, 3]]  # QImage ARGB32 is BGRA in memory
+        self._pixels = pixels
+        self._image = QImage(pixels.data, width, height, width * 4, QImage.Format_ARGB32)
+        self._image_key = key
+        return self._image
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.background_color)
+        if self.peaks is None or self.view_end <= self.view_start or self.width() <= 0:
+            return
+
+        painter.drawImage(0, 0, self._render_image())
+
+        playhead = self._time_to_x(self.position)
+        painter.fillRect(QRectF(0, 0, max(0.0, playhead), self.height()), self.played_color)
+        painter.setPen(QPen(self.playhead_color, 1))
+        painter.drawLine(int(playhead), 0, int(playhead), self.height())
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and self.duration > 0:
+            self.seek_requested.emit(self._x_to_time(event.x()))
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() & Qt.LeftButton and self.duration > 0:
+            self.seek_requested.emit(self._x_to_time(event.x()))
+
+    def mouseDoubleClickEvent(self, event):
+        self.reset_zoom()
+
+    def wheelEvent(self, event):
+        if self.duration <= 0:
+            return
+        anchor = self._x_to_time(event.x())
+        factor = 0.8 if event.angleDelta().y() > 0 else 1.25
+        span = min(self.duration, max(0.05, (self.view_end - self.view_start) * factor))
+        ratio = event.x() / max(self.width(), 1)
+        start = min(max(anchor - span * ratio, 0.0), self.duration - span)
+        self.view_start, self.view_end = start, start + span
+        self.update()